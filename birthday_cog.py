@@ -1,11 +1,68 @@
 import discord 
 from discord import app_commands
-from discord.ext import tasks
-from datetime import datetime, date
+from collections import deque
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+import asyncio
 import logging
+import time
+
+from text_utils import chunk_lines
 
 logger = logging.getLogger(__name__)
 
+# Discord's per-channel message bucket is 5 messages / 5 seconds
+CHANNEL_SEND_RATE = 5
+CHANNEL_SEND_PER = 5.0
+MESSAGE_LIMIT = 2000
+EMBED_DESCRIPTION_LIMIT = 4096
+
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+@lru_cache(maxsize=4096)
+def _fmt_birthday(year: int, month: int, day: int) -> str:
+    """Format a birthday like strftime('%B %d, %Y') would, e.g. 'June 05, 1995'."""
+    return f"{_MONTHS[month - 1]} {day:02d}, {year}"
+
+
+# Hour (UTC) at which the daily birthday announcements go out
+BIRTHDAY_HOUR = 6
+
+# After this many consecutive Forbidden/NotFound failures a channel is skipped
+# for BREAKER_COOLDOWN seconds. Sends happen once a day, so the cooldown spans
+# several runs rather than a few hours.
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 7 * 24 * 3600
+
+BIRTHDAY_MESSAGE = "🎂 It's {mention}'s birthday today! They are turning **{age}** years old! Happy Birthday! 🎉"
+
+
+class ChannelRateLimiter:
+    """Sliding-window limiter allowing at most `rate` sends per `per` seconds."""
+
+    def __init__(self, rate: int = CHANNEL_SEND_RATE, per: float = CHANNEL_SEND_PER):
+        self.rate = rate
+        self.per = per
+        self._sent = deque()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        async with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= self.per:
+                self._sent.popleft()
+            if len(self._sent) >= self.rate:
+                await asyncio.sleep(self.per - (now - self._sent[0]))
+                self._sent.popleft()
+            self._sent.append(time.monotonic())
+
+    async def __aexit__(self, *exc):
+        return False
+
 
 class BirthdaySetModal(discord.ui.Modal, title="Set Birthday"):
     def __init__(self, target_user: discord.Member, db):
@@ -18,16 +75,19 @@ class BirthdaySetModal(discord.ui.Modal, title="Set Birthday"):
     year = discord.ui.TextInput(label="Year of birth", placeholder="e.g. 1995", min_length=4, max_length=4)
 
     async def on_submit(self, interaction: discord.Interaction):
+        now = datetime.now()
         try:
             day = int(self.day.value)
             month = int(self.month.value)
             year = int(self.year.value)
-            birthday = datetime(year=year, month=month, day=day)
+            # Cheap range screen first; datetime() still catches e.g. 31 April / 29 February
+            if not (1 <= month <= 12 and 1 <= day <= 31):
+                raise ValueError
+            datetime(year=year, month=month, day=day)
         except ValueError:
             await interaction.response.send_message("❌ Invalid date. Please check the day, month, and year.", ephemeral=True)
             return
 
-        now = datetime.now()
         age = now.year - year - ((now.month, now.day) < (month, day))
         if age < 0 or age > 130:
             await interaction.response.send_message("❌ That doesn't look like a valid birth year.", ephemeral=True)
@@ -35,10 +95,11 @@ class BirthdaySetModal(discord.ui.Modal, title="Set Birthday"):
 
         self.db.set_birthday(guild_id=interaction.guild.id, user_id=self.target_user.id, day=day, month=month, year=year)
 
+        formatted = _fmt_birthday(year, month, day)
         if self.target_user.id == interaction.user.id:
-            msg = f"🎂 Your birthday has been set to **{birthday.strftime('%B %d, %Y')}**!"
+            msg = f"🎂 Your birthday has been set to **{formatted}**!"
         else:
-            msg = f"🎂 Birthday for {self.target_user.mention} set to **{birthday.strftime('%B %d, %Y')}**!"
+            msg = f"🎂 Birthday for {self.target_user.mention} set to **{formatted}**!"
 
         await interaction.response.send_message(msg, ephemeral=True)
 
@@ -49,62 +110,142 @@ class BirthdayChecker:
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
-        self._last_birthday_date: date | None = None
+        # Persisted so a restart inside the birthday window doesn't announce twice
+        last_sent = self.db.get_meta("last_birthday_date")
+        self._last_birthday_date: date | None = date.fromisoformat(last_sent) if last_sent else None
+        self._limiters: dict[int, ChannelRateLimiter] = {}
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self._failures: dict[int, int] = {}
+        self._broken: dict[int, float] = {}  # channel_id -> time the breaker closes again
 
     def start(self):
-        self._loop.start()
+        if self._task is None or self._task.done():
+            # A previous stop() leaves the event set; clear it so the new task runs
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
 
-    @tasks.loop(hours=1)
-    async def _loop(self):
-        now = datetime.utcnow()
-        today = now.date()
-        if now.hour == 6 and self._last_birthday_date != today:
-            await self._send_notifications(today)
+    def stop(self):
+        # Signal instead of cancelling so an in-flight burst finishes its current send
+        self._stop.set()
 
-    @_loop.before_loop
-    async def _before_loop(self):
+    async def _run(self):
+        """Sleep until the next BIRTHDAY_HOUR:00 UTC instead of waking every hour to check."""
         await self.bot.wait_until_ready()
         now = datetime.utcnow()
         today = now.date()
-        if now.hour == 6 and self._last_birthday_date != today:
+        if now.hour == BIRTHDAY_HOUR and self._last_birthday_date != today:
             logger.info("Bot started during birthday window — running startup catch-up")
-            await self._send_notifications(today)
+            try:
+                await self._send_notifications(today)
+            except Exception as e:
+                logger.error(f"Error in birthday startup catch-up: {e}")
+
+        while not self._stop.is_set():
+            now = datetime.utcnow()
+            target = now.replace(hour=BIRTHDAY_HOUR, minute=0, second=0, microsecond=0)
+            if now >= target:
+                target += timedelta(days=1)
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=(target - now).total_seconds())
+                return
+            except asyncio.TimeoutError:
+                pass
+            today = target.date()
+            if self._last_birthday_date == today:
+                continue
+            try:
+                await self._send_notifications(today)
+            except Exception as e:
+                logger.error(f"Error in birthday check: {e}")
 
     async def _send_notifications(self, today: date):
-        for guild in self.bot.guilds:
-            channel_id = self.db.get_birthday_channel(guild.id)
-            if not channel_id:
+        channels = self.db.get_all_birthday_channels()
+        by_guild = self.db.get_birthdays_for_date(month=today.month, day=today.day)
+        year_today = today.year
+        jobs = []
+        now_ts = time.time()
+        # Only visit guilds that have a birthday channel and a birthday today
+        for guild_id, channel_id in channels.items():
+            birthdays = by_guild.get(guild_id)
+            if not birthdays or self._broken.get(channel_id, 0) > now_ts:
+                continue
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
                 continue
             channel = guild.get_channel(channel_id)
             if not channel:
                 continue
-            birthdays = self.db.get_birthdays_on(guild_id=guild.id, month=today.month, day=today.day)
+            # One combined message per channel instead of one send per member
+            lines = []
             for b in birthdays:
                 member = guild.get_member(b["user_id"])
                 if not member:
                     continue
-                age = today.year - b["year"]
-                try:
-                    await channel.send(
-                        f"🎂 It's {member.mention}'s birthday today! "
-                        f"They are turning **{age}** years old! Happy Birthday! 🎉"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send birthday message in guild {guild.id}: {e}")
+                lines.append(BIRTHDAY_MESSAGE.format(mention=member.mention, age=year_today - b["year"]))
+            if lines:
+                jobs.append((channel, lines))
+
+        # Channels have independent rate-limit buckets, so notify them concurrently
+        results = await asyncio.gather(
+            *(self._notify_channel(channel, lines) for channel, lines in jobs),
+            return_exceptions=True
+        )
+        for (channel, _), result in zip(jobs, results):
+            if isinstance(result, (discord.Forbidden, discord.NotFound)):
+                self._record_failure(channel)
+            elif not isinstance(result, Exception):
+                self._failures.pop(channel.id, None)
+                self._broken.pop(channel.id, None)
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send birthday message in guild {channel.guild.id}: {result}")
         self._last_birthday_date = today
+        self.db.set_meta("last_birthday_date", today.isoformat())
         logger.info(f"Birthday notifications sent for {today}")
 
+    def _record_failure(self, channel):
+        failures = self._failures.get(channel.id, 0) + 1
+        self._failures[channel.id] = failures
+        if failures >= BREAKER_THRESHOLD:
+            self._broken[channel.id] = time.time() + BREAKER_COOLDOWN
+            logger.warning(
+                f"Birthday channel {channel.id} in guild {channel.guild.id} failed {failures} runs in a row — "
+                f"skipping it for {BREAKER_COOLDOWN // 86400} days"
+            )
+
+    async def _notify_channel(self, channel, lines: list):
+        for content in chunk_lines(lines, MESSAGE_LIMIT):
+            if self._stop.is_set():
+                break
+            await self._send(channel, content)
+
+    async def _send(self, channel, content: str):
+        """Send a message through the channel's rate limiter; discord.py retries 429s itself."""
+        limiter = self._limiters.setdefault(channel.id, ChannelRateLimiter())
+        async with limiter:
+            await channel.send(content)
+
+
+def _member_name(member, user_id: int) -> str:
+    return member.display_name if member else f"Unknown ({user_id})"
+
 
 def _is_mod_or_admin(member: discord.Member) -> bool:
-    return (
-        member.guild_permissions.administrator
-        or member.guild_permissions.manage_guild
-        or any(r.permissions.manage_messages for r in member.roles)
-    )
+    if member.id == member.guild.owner_id:
+        return True
+    p = member.guild_permissions
+    return p.administrator or p.manage_guild or p.manage_messages
 
 
 async def setup(discord_bot):
+    # Already set up: the commands are registered and the checker exists, so a
+    # repeated setup only makes sure the daily timer is running
+    checker = getattr(discord_bot, "birthday_checker", None)
+    if checker is not None:
+        checker.start()
+        return
     checker = BirthdayChecker(discord_bot)
+    discord_bot.birthday_checker = checker
     checker.start()
 
     @discord_bot.tree.command(name="birthday", description="Set a birthday — yours, or another user's (mods/admins only)")
@@ -142,14 +283,19 @@ async def setup(discord_bot):
         if not birthdays:
             await interaction.response.send_message("No birthdays have been set yet.", ephemeral=True)
             return
-        birthdays.sort(key=lambda b: (b["month"], b["day"]))
-        lines = []
-        for b in birthdays:
-            member = interaction.guild.get_member(b["user_id"])
-            name = member.display_name if member else f"Unknown ({b['user_id']})"
-            dt = datetime(year=b["year"], month=b["month"], day=b["day"])
-            lines.append(f"**{name}** — {dt.strftime('%B %d, %Y')}")
-        embed = discord.Embed(title="🎂 Server Birthdays", description="\n".join(lines), color=discord_bot.db.get_embed_color(interaction.guild.id))
+        # Rows come back already ordered by (month, day)
+        get_member = interaction.guild.get_member
+        lines = [
+            f"**{_member_name(get_member(b['user_id']), b['user_id'])}** — "
+            f"{_fmt_birthday(b['year'], b['month'], b['day'])}"
+            for b in birthdays
+        ]
+        # Large servers can overflow a single embed description, so page across embeds
+        color = discord_bot.db.get_embed_color(interaction.guild.id)
+        pages = chunk_lines(lines, EMBED_DESCRIPTION_LIMIT)
+        embed = discord.Embed(title="🎂 Server Birthdays", description=pages[0], color=color)
         await interaction.response.send_message(embed=embed, ephemeral=True)
+        for page in pages[1:]:
+            await interaction.followup.send(embed=discord.Embed(description=page, color=color), ephemeral=True)
 
     logger.info("Birthday commands registered")
@@ -7,12 +7,17 @@ import discord
 from discord import app_commands
 from discord.ext import tasks
 import asyncio
+import functools
+import io
 import logging
 import psutil
 import os
-from datetime import datetime, timedelta
+import re
+import time
+from datetime import datetime, timedelta, timezone
 from database import Database
 from twitch_api import TwitchAPI
+from text_utils import chunk_lines
 from config import DISCORD_TOKEN, CHECK_INTERVAL_SECONDS, BOT_OWNER_ID, LOG_CHANNEL_ID
 from config import TWITCH_BOT_USERNAME, TWITCH_BOT_TOKEN
 
@@ -23,6 +28,112 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Stream-length milestones (hours, message) announced by check_milestones
+MILESTONE_MESSAGES = (
+    (5, "⏱️ **{name}** has been live for **5 HOURS!** They're not stopping anytime soon!"),
+    (10, "💀 **{name}** has been live for **10 HOURS STRAIGHT.** Send help. 👀"),
+)
+
+
+# Channel URLs are this prefix plus the login
+TWITCH_BASE = "https://twitch.tv/"
+
+TWITCH_FAVICON_URL = "https://static.twitchcdn.net/assets/favicon-32-e29e246c157142c94346.png"
+
+# Size filled into Helix '{width}x{height}' thumbnail templates for embed images
+THUMBNAIL_SIZE = {"width": "440", "height": "248"}
+
+# Shared styling for the "Watch Stream" link button; only the URL varies per stream
+WATCH_BUTTON_KW = {"label": "Watch Stream", "style": discord.ButtonStyle.link, "emoji": "🔴"}
+
+# Discord's per-embed limits: fields, and characters across title, description,
+# field names/values, footer and author combined
+EMBED_MAX_FIELDS = 25
+EMBED_MAX_CHARS = 6000
+
+# Six hex digits, as accepted by /color (after stripping a leading '#')
+_HEX_COLOR_RE = re.compile(r'[0-9a-fA-F]{6}')
+
+# EventSub subscription sync interval, and the slower one used while no
+# streamers are monitored at all (single adds register their own subscriptions)
+EVENTSUB_SYNC_MINUTES = 30
+EVENTSUB_IDLE_SYNC_MINUTES = 120
+
+# Upper bound on go-live notification sends in flight at once, across all
+# concurrent stream.online events
+NOTIFICATION_CONCURRENCY = 8
+
+# Channels cleaned concurrently by the hourly cleanup_channels loop
+CLEANUP_CONCURRENCY = 5
+
+
+def iter_streamer_lines(lines):
+    """Yield lowercased names from an import file's lines, skipping blanks and # comments."""
+    for raw in lines:
+        name = raw.strip()
+        if name and not name.startswith('#'):
+            yield name.lower()
+
+
+def preview_names(names: list, limit: int) -> str:
+    """Comma-join names up to `limit` chars, noting how many more were left out."""
+    size = 0
+    for i, name in enumerate(names):
+        # ", " only goes between names
+        size += len(name) + (2 if i else 0)
+        if size > limit:
+            if not i:
+                return f"... (+{len(names)} more)"
+            return ", ".join(names[:i]) + f", ... (+{len(names) - i} more)"
+    return ", ".join(names)
+
+
+def render_thumbnail_url(template: str) -> str:
+    """Fill a Twitch '{width}x{height}' thumbnail template at the 440x248 size used in embeds."""
+    try:
+        return template.format_map(THUMBNAIL_SIZE)
+    except (KeyError, IndexError, ValueError):
+        # Stray braces in the URL — substitute the two placeholders literally
+        return template.replace('{width}', '440', 1).replace('{height}', '248', 1)
+
+
+def build_stream_embed(stream: dict, description: str, titled: bool = True) -> discord.Embed:
+    """Build a stream embed (author, game, viewers, thumbnail, footer) without a colour.
+
+    titled adds the stream title linking to the channel, as go-live notifications do.
+    Callers give each guild a copy with its own colour.
+    """
+    url = TWITCH_BASE + stream['user_login']
+    embed = discord.Embed(description=description, timestamp=datetime.now(timezone.utc))
+    if titled:
+        embed.title = stream['title']
+        embed.url = url
+    # None (not '') keeps icon_url out of the payload when there is no profile image
+    embed.set_author(name=stream['user_name'], url=url, icon_url=stream.get('profile_image_url') or None)
+    embed.add_field(name="Game", value=stream['game_name'] or "No category", inline=True)
+    embed.add_field(name="Viewers", value=f"{stream['viewer_count']:,}", inline=True)
+    embed.set_image(url=render_thumbnail_url(stream['thumbnail_url']))
+    embed.set_footer(text="Twitch", icon_url=TWITCH_FAVICON_URL)
+    return embed
+
+
+@functools.lru_cache(maxsize=256)
+def build_watch_view(user_login: str) -> discord.ui.View:
+    """Return the shared "Watch Stream" link-button view for a channel.
+
+    Link buttons are never dispatched, so discord.py doesn't store or mutate the
+    view when sending it and one instance can be reused for every message.
+    """
+    view = discord.ui.View(timeout=None)
+    view.add_item(discord.ui.Button(url=TWITCH_BASE + user_login, **WATCH_BUTTON_KW))
+    return view
+
+
+def build_live_embed(stream: dict) -> discord.Embed:
+    """Build the go-live embed for a stream, without a colour."""
+    return build_stream_embed(stream, f"**{stream['user_name']}** is now live!")
+
+
 class TwitchNotifierBot(discord.Client):
     def __init__(self):
         # Required intents for the bot
@@ -38,15 +149,28 @@ class TwitchNotifierBot(discord.Client):
         
         # Track which streamers are currently live to avoid duplicate notifications
         self.live_streamers = set()
+
+        # Shared by every stream.online burst so simultaneous go-lives don't all
+        # hit Discord's rate limiter at once
+        self.notification_semaphore = asyncio.Semaphore(NOTIFICATION_CONCURRENCY)
         
-        # Track bot start time for uptime calculation
-        self.start_time = datetime.utcnow()
+        # Track bot start time for uptime calculation; the monotonic reading is
+        # immune to wall-clock jumps and is what uptime displays are computed from
+        self.start_time = datetime.now(timezone.utc)
+        self.start_monotonic = time.monotonic()
+
+        # Process handle for /stats and /botinfo; prime cpu_percent so the
+        # sample_cpu loop can read it without blocking (interval=None returns
+        # usage since the previous call)
+        self.process = psutil.Process()  # defaults to this process
+        self.process.cpu_percent(None)
+        self.cpu_percent = 0.0
         
         # Track cleanup statistics
         self.cleanup_stats = {'last_run': None, 'total_deleted': 0}
         
         # Track errors for DM alerts (rate limiting)
-        self.error_alerts_sent = {}  # {error_key: timestamp}
+        self.error_alerts_sent = {}  # {error_key: time.monotonic() when sent}
         self.alert_cooldown = 3600  # Don't spam same error within 1 hour
     
     async def setup_hook(self):
@@ -123,10 +247,14 @@ class TwitchNotifierBot(discord.Client):
             cursor.execute("SELECT DISTINCT streamer_name FROM notification_messages")
             rows = cursor.fetchall()
             conn.close()
-            for (name,) in rows:
-                self.live_streamers.add(name.lower())
-            if rows:
-                logger.info(f"Restored {len(rows)} active streamer(s) from notification_messages into live_streamers")
+            notified = {name.lower() for (name,) in rows}
+            # Plus streamers notified before the restart whose messages weren't kept
+            recorded_live = {name.lower() for name in self.db.get_live_stream_names()} - notified
+            self.live_streamers |= notified | recorded_live
+            if notified:
+                logger.info(f"Restored {len(notified)} active streamer(s) from notification_messages into live_streamers")
+            if recorded_live:
+                logger.info(f"Restored {len(recorded_live)} live streamer(s) from live_streams")
         except Exception as e:
             logger.error(f"Failed to restore live_streamers from DB on startup: {e}")
         
@@ -165,6 +293,10 @@ class TwitchNotifierBot(discord.Client):
             self.update_stat_channels.start()
             logger.info("Stat channel update loop started")
 
+        # Start CPU sampling loop
+        if not self.sample_cpu.is_running():
+            self.sample_cpu.start()
+
         # Restore persistent VC control views
         try:
             active_vcs = self.db.get_all_active_vcs()
@@ -216,6 +348,22 @@ class TwitchNotifierBot(discord.Client):
                     color=0xFF6B35
                 )
 
+    async def _unregister_eventsub_if_unused(self, user_login: str):
+        """Delete a streamer's stream.online/offline EventSub once no guild monitors them."""
+        login = user_login.lower()
+        if self.db.get_servers_for_streamer(login):
+            return
+        user = await self.twitch.get_user(login)
+        if not user:
+            return
+        for sub in await self.twitch.get_subscriptions(user_id=user['id']):
+            if sub.get("type") not in ("stream.online", "stream.offline"):
+                continue
+            if sub.get("condition", {}).get("broadcaster_user_id") != user['id']:
+                continue
+            if await self.twitch.delete_subscription(sub["id"]):
+                logger.info(f"Deleted {sub['type']} EventSub for {login} (no longer monitored)")
+
     async def _initial_eventsub_sync(self):
         """Run EventSub sync on startup with a small delay to let things settle."""
         await asyncio.sleep(5)
@@ -245,6 +393,9 @@ class TwitchNotifierBot(discord.Client):
             await asyncio.sleep(1)
         except Exception:
             pass
+        # Stop the daily birthday scheduler
+        if hasattr(self, 'birthday_checker'):
+            self.birthday_checker.stop()
         # Clean up Twitch API session
         try:
             await self.twitch.close()
@@ -321,7 +472,7 @@ class TwitchNotifierBot(discord.Client):
                 if bypass_role and bypass_role in member.roles:
                     return
 
-            account_age_days = (datetime.utcnow() - member.created_at.replace(tzinfo=None)).days
+            account_age_days = (discord.utils.utcnow() - member.created_at).days
             reasons = []
 
             # Check account age
@@ -473,11 +624,17 @@ class TwitchNotifierBot(discord.Client):
     
     # ── EventSub Stream Notifications ────────────────────────────────────────
 
-    @tasks.loop(minutes=30)
+    @tasks.loop(minutes=EVENTSUB_SYNC_MINUTES)
     async def check_streams(self):
-        """Keep EventSub subscriptions healthy — re-register any missing ones every 30 min."""
+        """Keep EventSub subscriptions healthy — re-register any missing ones every 30 min.
+
+        Backs off to EVENTSUB_IDLE_SYNC_MINUTES while nothing is monitored.
+        """
         try:
             await self._sync_eventsub_subscriptions()
+            interval = EVENTSUB_SYNC_MINUTES if self.db.get_all_streamers() else EVENTSUB_IDLE_SYNC_MINUTES
+            if self.check_streams.minutes != interval:
+                self.check_streams.change_interval(minutes=interval)
         except Exception as e:
             logger.error(f"Error in EventSub sync loop: {e}", exc_info=True)
             await self.log_to_channel(
@@ -516,7 +673,7 @@ class TwitchNotifierBot(discord.Client):
         callback_url, secret = await self._eventsub_config()
 
         # Get all unique streamers from DB with guild info
-        streamers = self.db.get_all_streamers()
+        streamers = await asyncio.to_thread(self.db.get_all_streamers)
         if not streamers:
             return
 
@@ -533,21 +690,21 @@ class TwitchNotifierBot(discord.Client):
             if s.get('twitch_user_id') and login not in login_to_stored_id:
                 login_to_stored_id[login] = s['twitch_user_id']
 
-        # Split into those with stored IDs vs those needing API resolution
-        unique_logins = list({s['streamer_name'].lower() for s in streamers})
-        logins_with_id    = {l for l in unique_logins if l in login_to_stored_id}
-        logins_without_id = [l for l in unique_logins if l not in login_to_stored_id]
-
-        # Clear stale unresolvable records — will repopulate fresh below
-        self.db.clear_unresolvable_streamers()
+        # Split into those with stored IDs vs those needing API resolution;
+        # login_guilds is already keyed by each unique login
+        logins_with_id    = login_to_stored_id.keys()
+        logins_without_id = [l for l in login_guilds if l not in login_to_stored_id]
 
         # Get existing subscriptions so we don't double-register
         existing = await self.twitch.get_subscriptions()
+        # (and count them in the same pass for the mismatch check below)
         existing_keys = set()
+        existing_stream_subs = 0
         for sub in existing:
             if sub.get("type") in ("stream.online", "stream.offline"):
                 uid = sub.get("condition", {}).get("broadcaster_user_id", "")
                 existing_keys.add((sub["type"], uid))
+                existing_stream_subs += 1
 
         registered = 0
         failed = 0
@@ -576,42 +733,36 @@ class TwitchNotifierBot(discord.Client):
             await _register_if_needed(uid, login)
 
         # ── Resolve logins without stored IDs via Twitch API ──────────────────
-        for i in range(0, len(logins_without_id), 100):
-            batch = logins_without_id[i:i+100]
-            session = await self.twitch.get_session()
-            headers = await self.twitch._headers()
-            params = [("login", login) for login in batch]
-            try:
-                async with session.get(
-                    "https://api.twitch.tv/helix/users",
-                    headers=headers, params=params
-                ) as resp:
-                    if resp.status != 200:
-                        logger.warning(f"Failed to resolve user IDs for EventSub batch: {resp.status}")
-                        continue
-                    data = await resp.json()
-                    users = data.get("data", [])
-            except Exception as e:
-                logger.error(f"Error resolving user IDs for EventSub: {e}")
+        users = await self.twitch.get_users_bulk(logins_without_id) if logins_without_id else {}
+        # Logins mapped to None were in a batch whose request failed; their state is unknown
+        lookup_failed = [l for l in logins_without_id if l in users and users[l] is None]
+        if lookup_failed:
+            # Keep the previous sync's unresolvable records rather than losing
+            # them to an API error; this sync can still add newly found ones
+            logger.warning(f"Failed to resolve user IDs for {len(lookup_failed)} EventSub streamer(s)")
+        else:
+            # Clear stale unresolvable records — will repopulate fresh below
+            await asyncio.to_thread(self.db.clear_unresolvable_streamers)
+
+        for login in logins_without_id:
+            if login not in users:
+                guilds = login_guilds.get(login, [])
+                guild_str = ", ".join(dict.fromkeys(guilds))
+                unresolvable.append(f"{login} ({guild_str})")
+                logger.warning(f"EventSub: no Twitch user for '{login}' in [{guild_str}] — banned/deleted/renamed?")
+                for gid in login_guild_ids.get(login, []):
+                    await asyncio.to_thread(self.db.add_unresolvable_streamer, login, gid)
                 continue
 
-            resolved_logins = {u["login"].lower() for u in users}
-            for login in batch:
-                if login not in resolved_logins:
-                    guilds = login_guilds.get(login, [])
-                    guild_str = ", ".join(set(guilds))
-                    unresolvable.append(f"{login} ({guild_str})")
-                    logger.warning(f"EventSub: no Twitch user for '{login}' in [{guild_str}] — banned/deleted/renamed?")
-                    for gid in login_guild_ids.get(login, []):
-                        self.db.add_unresolvable_streamer(login, gid)
-
-            for user in users:
-                uid = user["id"]
-                login = user["login"].lower()
-                # Backfill the stored ID for all guilds monitoring this streamer
-                for gid in login_guild_ids.get(login, []):
-                    self.db.update_streamer_user_id(gid, login, uid)
-                await _register_if_needed(uid, login)
+            user = users[login]
+            if user is None:
+                continue
+
+            uid = user["id"]
+            # Backfill the stored ID for all guilds monitoring this streamer
+            for gid in login_guild_ids.get(login, []):
+                await asyncio.to_thread(self.db.update_streamer_user_id, gid, login, uid)
+            await _register_if_needed(uid, login)
 
         if registered or failed:
             logger.info(f"EventSub sync: registered {registered} new, {failed} failed, {len(unresolvable)} unresolvable")
@@ -629,9 +780,9 @@ class TwitchNotifierBot(discord.Client):
             )
 
         if alert_on_mismatch:
-            resolvable_count = len(unique_logins) - len(unresolvable)
+            resolvable_count = len(login_guilds) - len(unresolvable) - len(lookup_failed)
             expected = resolvable_count * 2
-            actual = len([s for s in existing if s.get("type") in ("stream.online", "stream.offline")]) + registered
+            actual = existing_stream_subs + registered
             missing = expected - actual
             threshold = max(20, int(expected * 0.10))
             if missing > threshold:
@@ -647,11 +798,23 @@ class TwitchNotifierBot(discord.Client):
                     f"Twitch may have revoked subscriptions. Next 30-min sync will attempt to re-register."
                 )
 
+    def _mark_live(self, user_login: str) -> str:
+        """Record a streamer as live; live_streamers only ever holds lowercase logins."""
+        login = user_login.lower()
+        self.live_streamers.add(login)
+        return login
+
+    def _mark_offline(self, user_login: str) -> str:
+        """Drop a streamer from live_streamers, returning the normalized login."""
+        login = user_login.lower()
+        self.live_streamers.discard(login)
+        return login
+
     async def handle_stream_online(self, user_login: str, user_id: str):
         """Called by the dashboard webhook when a stream.online event is received."""
         try:
             logger.info(f"EventSub stream.online: {user_login}")
-            self.live_streamers.add(user_login.lower())
+            login = self._mark_live(user_login)
 
             # Fetch full stream data
             stream = await self.twitch.get_stream_info_by_user_id(user_id)
@@ -664,22 +827,48 @@ class TwitchNotifierBot(discord.Client):
                     logger.error(f"Still no stream data for {user_login} after retry — skipping notification")
                     return
 
-            # Wait for thumbnail
-            logger.info(f"Waiting 15s for {user_login} thumbnail...")
-            await asyncio.sleep(15)
-
-            # Re-fetch after wait to get fresh thumbnail URL
-            stream = await self.twitch.get_stream_info_by_user_id(user_id) or stream
+            # One notification per broadcast, across restarts and repeated deliveries.
+            # The mark is only a claim until a send succeeds: it is rolled back if
+            # every send fails or this handler is cancelled, so a redelivery retries.
+            started_at = stream.get('started_at', '')
+            if not await asyncio.to_thread(self.db.mark_stream_live, login, started_at):
+                logger.info(f"Already notified for {user_login}'s current stream — skipping")
+                return
 
-            # Find all servers monitoring this streamer
-            streamers = self.db.get_all_streamers()
-            monitoring_servers = [
-                s for s in streamers
-                if s['streamer_name'].lower() == user_login.lower()
-            ]
+            delivered = False
+            try:
+                # Wait for thumbnail
+                logger.info(f"Waiting 15s for {user_login} thumbnail...")
+                await asyncio.sleep(15)
+
+                # Re-fetch after wait to get fresh thumbnail URL
+                stream = await self.twitch.get_stream_info_by_user_id(user_id) or stream
+
+                # Find all servers monitoring this streamer
+                monitoring_servers = self.db.get_servers_for_streamer(login)
+
+                # One lookup for every monitoring guild's embed colour, and one
+                # embed (with one timestamp) shared by every guild in this burst
+                colors = self.db.get_embed_colors_bulk([sd['guild_id'] for sd in monitoring_servers])
+                base_embed = build_live_embed(stream)
+
+                # Each guild's send is independent; send_notification logs its own failures
+                results = await asyncio.gather(
+                    *(
+                        self._send_notification_bounded(
+                            server_data, stream, embed_color=colors.get(server_data['guild_id']),
+                            base_embed=base_embed
+                        )
+                        for server_data in monitoring_servers
+                    ),
+                    return_exceptions=True
+                )
 
-            for server_data in monitoring_servers:
-                await self.send_notification(server_data, stream)
+                # Each delivered message was recorded by _send_notification_bounded
+                delivered = any(isinstance(r, tuple) for r in results)
+            finally:
+                if not delivered:
+                    self.db.clear_stream_live(login, started_at)
 
             await self.log_to_channel(
                 "🟢", "Stream Online (EventSub)",
@@ -699,17 +888,18 @@ class TwitchNotifierBot(discord.Client):
         """Called by the dashboard webhook when a stream.offline event is received."""
         try:
             logger.info(f"EventSub stream.offline: {user_login}")
-            name_lower = user_login.lower()
-            if name_lower in self.live_streamers:
-                self.live_streamers.discard(name_lower)
+            name_lower = self._mark_offline(user_login)
+            monitoring_servers = self.db.get_servers_for_streamer(name_lower)
 
-            # Clear milestones
-            streamers = self.db.get_all_streamers()
-            for s in streamers:
-                if s['streamer_name'].lower() == name_lower:
+            # Clear the live record and milestones off the event loop
+            def _clear_live_state():
+                self.db.clear_stream_live(name_lower)
+                for s in monitoring_servers:
                     self.db.clear_milestones_for_streamer(s['guild_id'], name_lower)
 
-            await self.delete_offline_notifications(user_login)
+            await asyncio.to_thread(_clear_live_state)
+
+            await self.delete_offline_notifications(user_login, monitoring_servers)
 
             await self.log_to_channel(
                 "🔴", "Stream Offline (EventSub)",
@@ -733,66 +923,73 @@ class TwitchNotifierBot(discord.Client):
         try:
             if not self.live_streamers:
                 return
-            streamers = self.db.get_all_streamers()
-            live_list = list(self.live_streamers)
-            for i in range(0, len(live_list), 100):
-                batch = live_list[i:i+100]
-                live_streams = await self.twitch.get_live_streams(batch)
-                for stream in live_streams:
-                    streamer_name = stream['user_login']
-                    stream_start = datetime.strptime(stream['started_at'], '%Y-%m-%dT%H:%M:%SZ')
-                    hours_live = (datetime.utcnow() - stream_start).total_seconds() / 3600
-                    for milestone_hours, description in [
-                        (5, f"⏱️ **{stream['user_name']}** has been live for **5 HOURS!** They're not stopping anytime soon!"),
-                        (10, f"💀 **{stream['user_name']}** has been live for **10 HOURS STRAIGHT.** Send help. 👀"),
-                    ]:
-                        if hours_live >= milestone_hours:
-                            monitoring_servers = [
-                                s for s in streamers
-                                if s['streamer_name'].lower() == streamer_name.lower()
-                            ]
-                            for server_data in monitoring_servers:
-                                guild_id = server_data['guild_id']
-                                if not self.db.get_milestone_notifications(guild_id):
-                                    continue
-                                if self.db.has_milestone_been_sent(guild_id, streamer_name, milestone_hours):
-                                    continue
-                                channel_id = server_data.get('custom_channel_id') or server_data['channel_id']
-                                channel = self.get_channel(channel_id)
-                                if not channel:
-                                    continue
-                                try:
-                                    embed_color = self.db.get_embed_color(guild_id)
-                                    embed = discord.Embed(
-                                        description=description,
-                                        color=embed_color,
-                                        timestamp=datetime.utcnow()
-                                    )
-                                    embed.set_author(
-                                        name=stream['user_name'],
-                                        url=f"https://twitch.tv/{stream['user_login']}",
-                                        icon_url=stream.get('profile_image_url', '')
-                                    )
-                                    embed.add_field(name="Game", value=stream['game_name'] or "No category", inline=True)
-                                    embed.add_field(name="Viewers", value=f"{stream['viewer_count']:,}", inline=True)
-                                    thumbnail_url = stream['thumbnail_url'].replace('{width}', '440').replace('{height}', '248')
-                                    embed.set_image(url=thumbnail_url)
-                                    embed.set_footer(text="Twitch", icon_url="https://static.twitchcdn.net/assets/favicon-32-e29e246c157142c94346.png")
-                                    view = discord.ui.View()
-                                    view.add_item(discord.ui.Button(
-                                        label="Watch Stream",
-                                        url=f"https://twitch.tv/{stream['user_login']}",
-                                        style=discord.ButtonStyle.link,
-                                        emoji="🔴"
-                                    ))
-                                    await channel.send(embed=embed, view=view)
-                                    self.db.record_milestone_sent(guild_id, streamer_name, milestone_hours)
-                                    logger.info(f"Sent {milestone_hours}h milestone for {streamer_name} in guild {guild_id}")
-                                except Exception as e:
-                                    logger.error(f"Error sending milestone notification: {e}")
+            # Resolve the opted-in guilds once per tick, and only poll live
+            # streamers that at least one of them monitors
+            enabled_guilds = self.db.get_milestone_enabled_guilds()
+            if not enabled_guilds:
+                return
+            # Sorted so batches keep a stable order between ticks
+            streamers_by_login = {}
+            for login in sorted(self.live_streamers):
+                servers = [s for s in self.db.get_servers_for_streamer(login) if s['guild_id'] in enabled_guilds]
+                if servers:
+                    streamers_by_login[login] = servers
+            live_list = list(streamers_by_login)
+            if not live_list:
+                return
+            # get_live_streams fans the batches of 100 out concurrently
+            live_streams = await self.twitch.get_live_streams(live_list)
+            now = datetime.now(timezone.utc)
+            sends = []
+            for stream in live_streams:
+                # Helix user_login is already lowercase, like the index keys
+                streamer_name = stream['user_login']
+                monitoring_servers = streamers_by_login.get(streamer_name)
+                if not monitoring_servers:
+                    continue
+                # Helix timestamps are RFC 3339 UTC ('...Z'), which fromisoformat parses on 3.11+
+                stream_start = datetime.fromisoformat(stream['started_at'])
+                hours_live = (now - stream_start).total_seconds() / 3600
+                for milestone_hours, template in MILESTONE_MESSAGES:
+                    if hours_live >= milestone_hours:
+                        # One embed per stream and milestone; guilds only differ in colour
+                        base_embed = None
+                        for server_data in monitoring_servers:
+                            guild_id = server_data['guild_id']
+                            if self.db.has_milestone_been_sent(guild_id, streamer_name, milestone_hours):
+                                continue
+                            channel_id = server_data.get('custom_channel_id') or server_data['channel_id']
+                            guild = self.get_guild(guild_id)
+                            channel = guild.get_channel_or_thread(channel_id) if guild else None
+                            if not channel:
+                                continue
+                            if base_embed is None:
+                                description = template.format(name=stream['user_name'])
+                                base_embed = build_stream_embed(stream, description, titled=False)
+                            sends.append(self._send_milestone(channel, guild_id, stream, milestone_hours, base_embed))
+            # Sends go to different channels, so run them together under the
+            # shared notification bound; _send_milestone logs its own failures
+            await asyncio.gather(*sends)
         except Exception as e:
             logger.error(f"Error in milestone check: {e}", exc_info=True)
 
+    async def _send_milestone(self, channel, guild_id: int, stream, milestone_hours: int, base_embed: discord.Embed):
+        """Post one stream-length milestone embed and record it as sent.
+
+        base_embed is shared across guilds, so it is copied, never mutated.
+        """
+        streamer_name = stream['user_login']
+        try:
+            async with self.notification_semaphore:
+                embed = base_embed.copy()
+                embed.colour = self.db.get_embed_color(guild_id)
+                view = build_watch_view(stream['user_login'])
+                await channel.send(embed=embed, view=view)
+            self.db.record_milestone_sent(guild_id, streamer_name, milestone_hours)
+            logger.info(f"Sent {milestone_hours}h milestone for {streamer_name} in guild {guild_id}")
+        except Exception as e:
+            logger.error(f"Error sending milestone notification: {e}")
+
     @check_milestones.before_loop
     async def before_check_milestones(self):
         await self.wait_until_ready()
@@ -801,7 +998,7 @@ class TwitchNotifierBot(discord.Client):
     async def check_streamer_renames(self):
         """Daily task — resolve all stored user IDs to current logins and update any renames."""
         try:
-            rows = self.db.get_all_streamers_with_ids()
+            rows = await asyncio.to_thread(self.db.get_all_streamers_with_ids)
             if not rows:
                 return
 
@@ -811,36 +1008,18 @@ class TwitchNotifierBot(discord.Client):
                 if r['twitch_user_id'] not in id_to_login:
                     id_to_login[r['twitch_user_id']] = r['streamer_name']
 
-            uid_list = list(id_to_login.keys())
             renamed = []
 
-            for i in range(0, len(uid_list), 100):
-                batch = uid_list[i:i+100]
-                session = await self.twitch.get_session()
-                headers = await self.twitch._headers()
-                params = [("id", uid) for uid in batch]
-                try:
-                    async with session.get(
-                        "https://api.twitch.tv/helix/users",
-                        headers=headers, params=params
-                    ) as resp:
-                        if resp.status != 200:
-                            continue
-                        data = await resp.json()
-                        users = data.get("data", [])
-                except Exception as e:
-                    logger.error(f"Error checking streamer renames: {e}")
-                    continue
-
-                for user in users:
-                    uid = user["id"]
-                    current_login = user["login"].lower()
-                    stored_login = id_to_login.get(uid, "").lower()
-                    if stored_login and current_login != stored_login:
-                        # Rename detected — update all rows across all guilds
-                        affected = self.db.update_streamer_login(stored_login, current_login)
-                        renamed.append(f"{stored_login} → {current_login} ({affected} guild(s))")
-                        logger.info(f"Streamer renamed: {stored_login} → {current_login} ({affected} guilds updated)")
+            # All batches of 100 IDs are requested concurrently
+            users = await self.twitch.get_users_by_ids(list(id_to_login))
+            for uid, user in users.items():
+                current_login = user["login"].lower()
+                stored_login = id_to_login.get(uid, "").lower()
+                if stored_login and current_login != stored_login:
+                    # Rename detected — update all rows across all guilds
+                    affected = await asyncio.to_thread(self.db.update_streamer_login, stored_login, current_login)
+                    renamed.append(f"{stored_login} → {current_login} ({affected} guild(s))")
+                    logger.info(f"Streamer renamed: {stored_login} → {current_login} ({affected} guilds updated)")
 
             if renamed:
                 await self.log_to_channel(
@@ -855,6 +1034,15 @@ class TwitchNotifierBot(discord.Client):
     async def before_check_streamer_renames(self):
         await self.wait_until_ready()
 
+    def _record_alert(self, error_key: str, sent_at: float):
+        """Start an alert's cooldown (sent_at is a time.monotonic() reading), dropping
+        entries whose cooldown has already expired once the table grows past a few
+        hundred keys."""
+        self.error_alerts_sent[error_key] = sent_at
+        if len(self.error_alerts_sent) > 256:
+            cutoff = sent_at - self.alert_cooldown
+            self.error_alerts_sent = {k: v for k, v in self.error_alerts_sent.items() if v > cutoff}
+
     async def alert_permission_issue(self, guild: discord.Guild, channel_id: int, issue: str):
         """DM the guild owner and bot owner when a permission issue is detected."""
         guild_owner = guild.owner
@@ -862,13 +1050,12 @@ class TwitchNotifierBot(discord.Client):
 
         # Rate limit guild owner DM to once per hour per guild, same as send_owner_alert
         error_key = f"perm_issue:{guild.id}"
-        current_time = datetime.utcnow()
+        current_time = time.monotonic()
         if error_key in self.error_alerts_sent:
-            time_diff = (current_time - self.error_alerts_sent[error_key]).total_seconds()
-            if time_diff < self.alert_cooldown:
+            if current_time - self.error_alerts_sent[error_key] < self.alert_cooldown:
                 logger.debug(f"Skipping guild owner DM for {guild.name} — cooldown active")
                 return
-        self.error_alerts_sent[error_key] = current_time
+        self._record_alert(error_key, current_time)
 
         admin_embed = discord.Embed(
             title="⚠️ ExcelProtocol Permission Issue",
@@ -920,14 +1107,36 @@ class TwitchNotifierBot(discord.Client):
             color=0xFF0000
         )
 
-    async def send_notification(self, server_data, stream):
-        """Send a notification embed to the configured channel"""
+    async def _send_notification_bounded(self, server_data, stream, **kwargs):
+        """send_notification, limited to NOTIFICATION_CONCURRENCY sends in flight.
+
+        Each delivered message is recorded as soon as it is sent, so a burst cut
+        short keeps the message IDs already posted (for auto-delete) and the
+        duplicate check sees them straight away.
+        """
+        async with self.notification_semaphore:
+            sent = await self.send_notification(server_data, stream, **kwargs)
+        if sent:
+            await asyncio.to_thread(self.db.record_notifications_sent, stream['user_login'], [sent])
+        return sent
+
+    async def send_notification(self, server_data, stream, embed_color: int = None,
+                                base_embed: discord.Embed = None):
+        """Send a notification embed to the configured channel.
+
+        embed_color and base_embed can be passed in by callers notifying many
+        guilds at once; base_embed is copied, never mutated. Returns
+        (guild_id, channel_id, message_id) when a message was sent; the caller
+        stores that via db.record_notifications_sent.
+        """
         try:
             guild = self.get_guild(server_data['guild_id'])
             # Bug 3 fix: honour custom_channel_id so the stored channel_id matches
             # where the message is actually sent (mirrors repostlive behaviour).
             effective_channel_id = server_data.get('custom_channel_id') or server_data['channel_id']
-            channel = self.get_channel(effective_channel_id)
+            # Resolve against the guild we already have; Client.get_channel scans every guild.
+            # Notification channels can be threads, which guild.get_channel doesn't return.
+            channel = guild.get_channel_or_thread(effective_channel_id) if guild else None
 
             if not channel:
                 logger.warning(f"Channel {effective_channel_id} not found")
@@ -976,68 +1185,24 @@ class TwitchNotifierBot(discord.Client):
             ping_content = f"<@&{ping_role_id}>" if ping_role_id else None
 
             # Get custom color for this server (or default)
-            embed_color = self.db.get_embed_color(server_data['guild_id'])
+            if embed_color is None:
+                embed_color = self.db.get_embed_color(server_data['guild_id'])
             
-            # Create embed notification
-            embed = discord.Embed(
-                title=stream['title'],
-                url=f"https://twitch.tv/{stream['user_login']}",
-                description=f"**{stream['user_name']}** is now live!",
-                color=embed_color,
-                timestamp=datetime.utcnow()
-            )
-            
-            embed.set_author(
-                name=stream['user_name'],
-                url=f"https://twitch.tv/{stream['user_login']}",
-                icon_url=stream.get('profile_image_url', '')
-            )
-            
-            embed.add_field(
-                name="Game",
-                value=stream['game_name'] or "No category",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="Viewers",
-                value=str(stream['viewer_count']),
-                inline=True
-            )
-            
-            # Use stream thumbnail
-            thumbnail_url = stream['thumbnail_url'].replace('{width}', '440').replace('{height}', '248')
-            embed.set_image(url=thumbnail_url)
-            
-            embed.set_footer(text="Twitch", icon_url="https://static.twitchcdn.net/assets/favicon-32-e29e246c157142c94346.png")
+            # Start from the shared per-stream embed when given; only the colour
+            # differs between guilds
+            if base_embed is None:
+                base_embed = build_live_embed(stream)
+            embed = base_embed.copy()
+            embed.colour = embed_color
             
             # Create Watch Stream button
-            view = discord.ui.View()
-            view.add_item(discord.ui.Button(
-                label="Watch Stream",
-                url=f"https://twitch.tv/{stream['user_login']}",
-                style=discord.ButtonStyle.link,
-                emoji="🔴"
-            ))
+            view = build_watch_view(stream['user_login'])
             
             # Send the notification
             message = await channel.send(content=ping_content, embed=embed, view=view)
             logger.info(f"Sent notification for {stream['user_name']} to {channel.guild.name}")
             
-            # Bug 1 fix: always save the message ID regardless of auto-delete setting.
-            # The flag is checked at delete time in delete_offline_notifications, not here.
-            self.db.save_notification_message(
-                server_data['guild_id'],
-                stream['user_login'],
-                effective_channel_id,
-                message.id
-            )
-            
-            # Log stream event for leaderboard
-            self.db.log_stream_event(server_data['guild_id'], stream['user_login'])
-
-            # Log notification for history
-            self.db.log_notification(server_data['guild_id'], stream['user_login'], effective_channel_id, 'sent')
+            return (server_data['guild_id'], effective_channel_id, message.id)
 
         except discord.Forbidden:
             logger.error(f"Forbidden sending notification in guild {server_data['guild_id']}")
@@ -1075,15 +1240,15 @@ class TwitchNotifierBot(discord.Client):
             except Exception:
                 pass
     
-    async def delete_offline_notifications(self, streamer_name: str):
-        """Delete notification messages when streamer goes offline"""
+    async def delete_offline_notifications(self, streamer_name: str, monitoring_servers: list = None):
+        """Delete notification messages when streamer goes offline
+
+        Callers that already looked up the monitoring servers can pass them in.
+        """
         try:
             # Get all servers monitoring this streamer
-            all_streamers = self.db.get_all_streamers()
-            monitoring_servers = [
-                s for s in all_streamers 
-                if s['streamer_name'].lower() == streamer_name.lower()
-            ]
+            if monitoring_servers is None:
+                monitoring_servers = self.db.get_servers_for_streamer(streamer_name)
             
             for server_data in monitoring_servers:
                 guild_id = server_data['guild_id']
@@ -1093,14 +1258,15 @@ class TwitchNotifierBot(discord.Client):
                     continue
                 
                 # Get all notification messages for this streamer
-                messages = self.db.get_notification_messages(guild_id, streamer_name)
+                messages = await asyncio.to_thread(self.db.get_notification_messages, guild_id, streamer_name)
+                guild = self.get_guild(guild_id)
                 
                 for msg_data in messages:
                     try:
-                        channel = self.get_channel(msg_data['channel_id'])
+                        channel = guild.get_channel_or_thread(msg_data['channel_id']) if guild else None
                         if channel:
-                            message = await channel.fetch_message(msg_data['message_id'])
-                            await message.delete()
+                            # Delete by ID; fetching the message first would cost an extra request
+                            await channel.get_partial_message(msg_data['message_id']).delete()
                             logger.info(f"Deleted notification {msg_data['message_id']} for {streamer_name}")
                     except discord.NotFound:
                         logger.warning(f"Message {msg_data['message_id']} not found (already deleted?)")
@@ -1110,7 +1276,7 @@ class TwitchNotifierBot(discord.Client):
                         logger.error(f"Error deleting message: {e}")
                 
                 # Clean up database records
-                self.db.delete_notification_messages(guild_id, streamer_name)
+                await asyncio.to_thread(self.db.delete_notification_messages, guild_id, streamer_name)
         
         except Exception as e:
             logger.error(f"Error in delete_offline_notifications: {e}", exc_info=True)
@@ -1125,13 +1291,10 @@ class TwitchNotifierBot(discord.Client):
         try:
             # Check if we already sent this alert recently (rate limiting)
             error_key = f"{error_type}:{guild_id or 'global'}"
-            current_time = datetime.utcnow()
+            current_time = time.monotonic()
             
             if error_key in self.error_alerts_sent:
-                last_sent = self.error_alerts_sent[error_key]
-                time_diff = (current_time - last_sent).total_seconds()
-                
-                if time_diff < self.alert_cooldown:
+                if current_time - self.error_alerts_sent[error_key] < self.alert_cooldown:
                     logger.debug(f"Skipping alert for {error_key} - cooldown active")
                     return
             
@@ -1157,7 +1320,7 @@ class TwitchNotifierBot(discord.Client):
                 title=f"🚨 Bot Error Alert: {error_type}",
                 description=details,
                 color=0xFF0000,
-                timestamp=current_time
+                timestamp=datetime.now(timezone.utc)
             )
             
             if guild_id:
@@ -1173,7 +1336,7 @@ class TwitchNotifierBot(discord.Client):
             await owner.send(embed=embed)
             
             # Mark as sent
-            self.error_alerts_sent[error_key] = current_time
+            self._record_alert(error_key, current_time)
             logger.info(f"Sent error alert to owner: {error_type}")
         
         except discord.Forbidden:
@@ -1195,7 +1358,7 @@ class TwitchNotifierBot(discord.Client):
                 title=f"{emoji} {title}",
                 description=description,
                 color=color,
-                timestamp=datetime.utcnow()
+                timestamp=discord.utils.utcnow()
             )
             embed.set_footer(text="ExcelProtocol Log")
             await channel.send(embed=embed)
@@ -1213,18 +1376,24 @@ class TwitchNotifierBot(discord.Client):
                 return
             
             logger.debug(f"Running cleanup for {len(configs)} channel(s)...")
-            total_deleted = 0
             
-            for config in configs:
-                deleted = await self.cleanup_channel(
-                    config['guild_id'],
-                    config['channel_id'],
-                    config['interval_hours'],
-                    config['keep_pinned']
-                )
-                total_deleted += deleted
+            # Channels are independent (Discord rate-limits deletes per channel),
+            # so clean several at once; cleanup_channel logs its own failures
+            sem = asyncio.Semaphore(CLEANUP_CONCURRENCY)
             
-            self.cleanup_stats['last_run'] = datetime.utcnow()
+            async def _run(config):
+                async with sem:
+                    return await self.cleanup_channel(
+                        config['guild_id'],
+                        config['channel_id'],
+                        config['interval_hours'],
+                        config['keep_pinned']
+                    )
+            
+            results = await asyncio.gather(*(_run(c) for c in configs), return_exceptions=True)
+            total_deleted = sum(r for r in results if isinstance(r, int))
+            
+            self.cleanup_stats['last_run'] = discord.utils.utcnow()
             self.cleanup_stats['total_deleted'] += total_deleted
             logger.debug(f"Cleanup complete: {total_deleted} messages deleted")
         
@@ -1253,7 +1422,7 @@ class TwitchNotifierBot(discord.Client):
     async def monthly_leaderboard_cleanup(self):
         """Check daily if it is the first of the month and clean old stream events"""
         try:
-            now = datetime.utcnow()
+            now = discord.utils.utcnow()
             if now.day == 1:
                 deleted = self.db.cleanup_stream_events()
                 logger.info(f"Monthly leaderboard reset: deleted {deleted} old stream events")
@@ -1287,46 +1456,49 @@ class TwitchNotifierBot(discord.Client):
     async def before_rotate_status(self):
         await self.wait_until_ready()
 
+    @tasks.loop(seconds=30)
+    async def sample_cpu(self):
+        """Record CPU usage over the last 30s for /stats (non-blocking read)."""
+        self.cpu_percent = self.process.cpu_percent(None)
+
     @tasks.loop(hours=3)
     async def refresh_broadcaster_tokens(self):
         """Proactively refresh all broadcaster OAuth tokens every 3 hours."""
-        import aiohttp
-        from datetime import timezone
         tokens = self.db.get_all_broadcaster_tokens()
         if not tokens:
             return
         refreshed = 0
+        # Token refreshes share the pooled Twitch API session
+        session = await self.twitch.get_session()
         for t in tokens:
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        "https://id.twitch.tv/oauth2/token",
-                        data={
-                            "grant_type": "refresh_token",
-                            "refresh_token": t["refresh_token"],
-                            "client_id": self.twitch.client_id,
-                            "client_secret": self.twitch.client_secret,
-                        }
-                    ) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            from datetime import datetime, timedelta
-                            expires_at = (datetime.utcnow() + timedelta(seconds=data["expires_in"])).isoformat()
-                            self.db.set_broadcaster_token(
-                                t["guild_id"], t["twitch_user_id"], t["twitch_login"],
-                                data["access_token"], data.get("refresh_token", t["refresh_token"]), expires_at
-                            )
-                            refreshed += 1
-                        else:
-                            logger.warning(f"Failed to refresh broadcaster token for guild {t['guild_id']}: {resp.status}")
-                            await self.log_to_channel(
-                                "🔑", "Broadcaster Token Refresh Failed",
-                                f"Failed to refresh Twitch token for guild `{t['guild_id']}` "
-                                f"(Twitch: **{t['twitch_login']}**)\n"
-                                f"HTTP status: `{resp.status}`\n"
-                                f"Their channel rewards overlay may stop working until they reconnect.",
-                                color=0xFF6B35
-                            )
+                async with session.post(
+                    "https://id.twitch.tv/oauth2/token",
+                    data={
+                        "grant_type": "refresh_token",
+                        "refresh_token": t["refresh_token"],
+                        "client_id": self.twitch.client_id,
+                        "client_secret": self.twitch.client_secret,
+                    }
+                ) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+                        expires_at = (discord.utils.utcnow() + timedelta(seconds=data["expires_in"])).isoformat()
+                        self.db.set_broadcaster_token(
+                            t["guild_id"], t["twitch_user_id"], t["twitch_login"],
+                            data["access_token"], data.get("refresh_token", t["refresh_token"]), expires_at
+                        )
+                        refreshed += 1
+                    else:
+                        logger.warning(f"Failed to refresh broadcaster token for guild {t['guild_id']}: {resp.status}")
+                        await self.log_to_channel(
+                            "🔑", "Broadcaster Token Refresh Failed",
+                            f"Failed to refresh Twitch token for guild `{t['guild_id']}` "
+                            f"(Twitch: **{t['twitch_login']}**)\n"
+                            f"HTTP status: `{resp.status}`\n"
+                            f"Their channel rewards overlay may stop working until they reconnect.",
+                            color=0xFF6B35
+                        )
             except Exception as e:
                 logger.error(f"Error refreshing broadcaster token for guild {t['guild_id']}: {e}")
                 await self.log_to_channel(
@@ -1393,7 +1565,7 @@ class TwitchNotifierBot(discord.Client):
                 channel_ids.add(s.get('custom_channel_id') or s['channel_id'])
 
             for channel_id in channel_ids:
-                channel = self.get_channel(channel_id)
+                channel = guild.get_channel_or_thread(channel_id)
                 if not channel:
                     continue
                 perms = channel.permissions_for(guild.me)
@@ -1458,10 +1630,10 @@ class TwitchNotifierBot(discord.Client):
     async def cleanup_channel(self, guild_id: int, channel_id: int, interval_hours: int, keep_pinned: bool) -> int:
         """Clean up old messages in a channel"""
         try:
-            channel = self.get_channel(channel_id)
+            guild = self.get_guild(guild_id)
+            channel = guild.get_channel_or_thread(channel_id) if guild else None
             
             if not channel:
-                guild = self.get_guild(guild_id)
                 guild_name = guild.name if guild else str(guild_id)
                 logger.warning(f"Channel {channel_id} not found for cleanup in guild {guild_name} ({guild_id})")
                 await self.log_to_channel(
@@ -1491,25 +1663,39 @@ class TwitchNotifierBot(discord.Client):
                 return 0
             
             # Calculate cutoff time
-            cutoff_time = datetime.utcnow() - timedelta(hours=interval_hours)
+            now = discord.utils.utcnow()
+            cutoff_time = now - timedelta(hours=interval_hours)
             
-            # Fetch messages older than cutoff
-            messages_to_delete = []
-            async for message in channel.history(limit=1000, before=cutoff_time):
-                # Skip if we want to keep pinned messages and this is pinned
-                if keep_pinned and message.pinned:
-                    continue
-                messages_to_delete.append(message)
+            # Fetch messages older than cutoff a page at a time (up to 1000),
+            # stopping at the end of the history or at a page with nothing to delete.
+            # Discord allows bulk delete for messages less than 14 days old, so
+            # sort each message into the right list as it arrives.
+            bulk_delete = []
+            individual_delete = []
+            before = cutoff_time
+            for _ in range(10):
+                page = [m async for m in channel.history(limit=100, before=before)]
+                if not page:
+                    break
+                before = page[-1]
+                eligible = 0
+                for message in page:
+                    # Skip if we want to keep pinned messages and this is pinned
+                    if keep_pinned and message.pinned:
+                        continue
+                    eligible += 1
+                    if (now - message.created_at).days < 14:
+                        bulk_delete.append(message)
+                    else:
+                        individual_delete.append(message)
+                if not eligible or len(page) < 100:
+                    break
             
-            if not messages_to_delete:
+            if not bulk_delete and not individual_delete:
                 logger.debug(f"No messages to delete in channel {channel_id}")
                 return 0
             
-            # Discord allows bulk delete for messages less than 14 days old
             deleted_count = 0
-            now = discord.utils.utcnow()
-            bulk_delete = [m for m in messages_to_delete if (now - m.created_at).days < 14]
-            individual_delete = [m for m in messages_to_delete if (now - m.created_at).days >= 14]
             
             # Bulk delete (100 at a time)
             for i in range(0, len(bulk_delete), 100):
@@ -1689,6 +1875,24 @@ class VCControlView(discord.ui.View):
 # Initialize bot
 bot = TwitchNotifierBot()
 
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    """Reply to failed permission checks; log anything else as discord.py would."""
+    if isinstance(error, app_commands.MissingPermissions):
+        perms = ", ".join(
+            p.replace('_', ' ').replace('guild', 'server').title() for p in error.missing_permissions
+        )
+        message = f"❌ You need '{perms}' permission to use this command."
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
+        return
+    command = interaction.command
+    logger.error(f"Ignoring exception in command {command.name if command else 'tree'!r}", exc_info=error)
+
+
 def sanitise_streamer_name(raw: str) -> str:
     """Strip URLs and whitespace from a streamer input, returning just the username.
     Handles inputs like 'https://twitch.tv/username', 'twitch.tv/username', '@username'."""
@@ -1713,15 +1917,9 @@ def sanitise_streamer_name(raw: str) -> str:
     streamer="Twitch username to monitor",
     channel="Optional: post notifications to this channel instead of the default"
 )
+@app_commands.checks.has_permissions(manage_guild=True)
 async def add_streamer(interaction: discord.Interaction, streamer: str, channel: discord.TextChannel = None):
     """Add a streamer to monitor in this server"""
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-
     # Determine which channel to use
     if channel:
         channel_id = channel.id
@@ -1753,7 +1951,10 @@ async def add_streamer(interaction: discord.Interaction, streamer: str, channel:
         )
         return
 
-    success = bot.db.add_streamer(interaction.guild_id, user_info['login'], channel_id, custom_channel_id=channel.id if channel else None, twitch_user_id=user_info['id'])
+    success = await asyncio.to_thread(
+        bot.db.add_streamer, interaction.guild_id, user_info['login'], channel_id,
+        custom_channel_id=channel.id if channel else None, twitch_user_id=user_info['id']
+    )
 
     if success:
         custom = " (custom channel)" if channel else ""
@@ -1778,22 +1979,18 @@ async def add_streamer(interaction: discord.Interaction, streamer: str, channel:
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="removestreamer", description="Stop monitoring a Twitch streamer")
 @app_commands.describe(streamer="Twitch username to stop monitoring")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def remove_streamer(interaction: discord.Interaction, streamer: str):
     """Remove a streamer from monitoring"""
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
-    success = bot.db.remove_streamer(interaction.guild_id, streamer)
+    success = await asyncio.to_thread(bot.db.remove_streamer, interaction.guild_id, streamer)
     
     if success:
         await interaction.response.send_message(
             f"✅ No longer monitoring **{streamer}**",
             ephemeral=True
         )
+        # Stop Twitch pushing events for a streamer nobody monitors any more
+        asyncio.create_task(bot._unregister_eventsub_if_unused(streamer))
         await bot.log_to_channel(
             "➖", "Streamer Removed",
             f"**{streamer}** removed in **{interaction.guild.name}**\nBy: {interaction.user} (`{interaction.user.id}`)",
@@ -1808,7 +2005,7 @@ async def remove_streamer(interaction: discord.Interaction, streamer: str):
 @bot.tree.command(name="streamers", description="List all monitored streamers in this server")
 async def list_streamers(interaction: discord.Interaction):
     """Show all streamers being monitored in this server"""
-    streamers = bot.db.get_server_streamers(interaction.guild_id)
+    streamers = await asyncio.to_thread(bot.db.get_server_streamers, interaction.guild_id)
     
     if not streamers:
         await interaction.response.send_message(
@@ -1835,44 +2032,24 @@ async def list_streamers(interaction: discord.Interaction):
         )
     
     # Split streamers into chunks to avoid 1024 character limit per field
-    streamer_links = []
-    for s in streamers:
-        line = f"• [{s['streamer_name']}](https://twitch.tv/{s['streamer_name']})"
-        if s.get('custom_channel_id'):
-            line += f" → <#{s['custom_channel_id']}>"
-        streamer_links.append(line)
-    
-    # Build fields with max 1000 characters each (safe margin)
-    current_field = []
-    current_length = 0
-    field_num = 1
-    
-    for link in streamer_links:
-        link_length = len(link) + 1  # +1 for newline
-        
-        if current_length + link_length > 1000 and current_field:
-            # Add current field and start a new one
-            field_name = "Streamers" if field_num == 1 else f"Streamers (continued {field_num})"
-            embed.add_field(
-                name=field_name,
-                value="\n".join(current_field),
-                inline=False
-            )
-            current_field = [link]
-            current_length = link_length
-            field_num += 1
-        else:
-            current_field.append(link)
-            current_length += link_length
+    streamer_links = (
+        f"• [{s['streamer_name']}]({TWITCH_BASE}{s['streamer_name']})"
+        + (f" → <#{s['custom_channel_id']}>" if s.get('custom_channel_id') else "")
+        for s in streamers
+    )
     
-    # Add the last field
-    if current_field:
+    # Build fields with max 1000 characters each (safe margin), stopping before
+    # the embed itself outgrows Discord's field count or total size
+    shown = 0
+    for field_num, value in enumerate(chunk_lines(streamer_links, 1000), start=1):
         field_name = "Streamers" if field_num == 1 else f"Streamers (continued {field_num})"
-        embed.add_field(
-            name=field_name,
-            value="\n".join(current_field),
-            inline=False
-        )
+        if (len(embed.fields) >= EMBED_MAX_FIELDS
+                or len(embed) + len(field_name) + len(value) > EMBED_MAX_CHARS - 100):
+            break
+        embed.add_field(name=field_name, value=value, inline=False)
+        shown += value.count("\n") + 1
+    if shown < len(streamers):
+        embed.set_footer(text=f"… and {len(streamers) - shown} more not shown")
     
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
@@ -1884,7 +2061,7 @@ async def check_live(interaction: discord.Interaction):
     """Manually check which streamers are live"""
     await interaction.response.defer(ephemeral=True)
     
-    streamers = bot.db.get_server_streamers(interaction.guild_id)
+    streamers = await asyncio.to_thread(bot.db.get_server_streamers, interaction.guild_id)
     
     if not streamers:
         await interaction.followup.send(
@@ -1917,7 +2094,7 @@ async def check_live(interaction: discord.Interaction):
             value=f"**{stream['title']}**\n"
                   f"Playing: {stream['game_name'] or 'No category'}\n"
                   f"Viewers: {stream['viewer_count']}\n"
-                  f"[Watch Now](https://twitch.tv/{stream['user_login']})",
+                  f"[Watch Now]({TWITCH_BASE}{stream['user_login']})",
             inline=False
         )
     
@@ -1927,26 +2104,24 @@ async def check_live(interaction: discord.Interaction):
 async def bot_stats(interaction: discord.Interaction):
     """Display bot statistics including memory usage and uptime"""
     # Get process info
-    process = psutil.Process(os.getpid())
+    process = bot.process
     memory_info = process.memory_info()
     
     # Memory usage in MB
-    memory_mb = memory_info.rss / 1024 / 1024
+    memory_mb = memory_info.rss / (1 << 20)
     memory_percent = (memory_mb / 256) * 100  # Percentage of 256MB
     
-    # CPU usage
-    cpu_percent = process.cpu_percent(interval=0.1)
+    # CPU usage over the last sampling window (see sample_cpu)
+    cpu_percent = bot.cpu_percent
     
     # Uptime
-    uptime = datetime.utcnow() - bot.start_time
-    days = uptime.days
-    hours, remainder = divmod(uptime.seconds, 3600)
+    uptime_seconds = int(time.monotonic() - bot.start_monotonic)
+    days, remainder = divmod(uptime_seconds, 86400)
+    hours, remainder = divmod(remainder, 3600)
     minutes, seconds = divmod(remainder, 60)
     
     # Database stats
-    all_streamers = bot.db.get_all_streamers()
-    unique_streamers = len(set(s['streamer_name'] for s in all_streamers))
-    total_servers = len(set(s['guild_id'] for s in all_streamers))
+    unique_streamers, monitoring_servers, _, _ = await asyncio.to_thread(bot.db.get_streamer_stats)
     
     # Currently live streamers
     currently_live = len(bot.live_streamers)
@@ -1955,7 +2130,7 @@ async def bot_stats(interaction: discord.Interaction):
     embed = discord.Embed(
         title="📊 Bot Statistics",
         color=bot.db.get_embed_color(interaction.guild_id),
-        timestamp=datetime.utcnow()
+        timestamp=discord.utils.utcnow()
     )
     
     # Memory bar visualization
@@ -1989,7 +2164,13 @@ async def bot_stats(interaction: discord.Interaction):
     
     embed.add_field(
         name="📺 Monitoring",
-        value=f"{unique_streamers} unique streamer(s)\n{total_servers} server(s)",
+        value=f"{unique_streamers} unique streamer(s)\n{monitoring_servers} server(s) with monitors",
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🏠 Servers",
+        value=f"{len(bot.guilds)} server(s)",
         inline=True
     )
     
@@ -2018,22 +2199,15 @@ async def bot_stats(interaction: discord.Interaction):
 
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="testnotification", description="Send a test stream notification to see what it looks like")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def test_notification(interaction: discord.Interaction):
     """Send a test notification to preview the embed design"""
-    # Check if user has manage guild permission
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
-    # Get the notification channel
-    channel_id = bot.db.get_notification_channel(interaction.guild_id)
+    # Get the notification channel (and the color used below)
+    channel_id, embed_color, _ = bot.db.get_notification_settings(interaction.guild_id)
     if not channel_id:
         channel_id = interaction.channel_id
     
-    channel = bot.get_channel(channel_id)
+    channel = interaction.guild.get_channel_or_thread(channel_id)
     
     if not channel:
         await interaction.response.send_message(
@@ -2053,54 +2227,16 @@ async def test_notification(interaction: discord.Interaction):
         'profile_image_url': 'https://static-cdn.jtvnw.net/jtv_user_pictures/default_profile_image-300x300.png'
     }
     
-    # Create the same embed as real notifications
-    embed = discord.Embed(
-        title=fake_stream['title'],
-        url=f"https://twitch.tv/{fake_stream['user_login']}",
-        description=f"**{fake_stream['user_name']}** is now live!",
-        color=bot.db.get_embed_color(interaction.guild_id),  # Use server custom color
-        timestamp=datetime.utcnow()
-    )
-    
-    embed.set_author(
-        name=fake_stream['user_name'],
-        url=f"https://twitch.tv/{fake_stream['user_login']}",
-        icon_url=fake_stream.get('profile_image_url', '')
-    )
-    
-    embed.add_field(
-        name="Game",
-        value=fake_stream['game_name'] or "No category",
-        inline=True
-    )
-    
-    embed.add_field(
-        name="Viewers",
-        value=str(fake_stream['viewer_count']),
-        inline=True
-    )
-    
-    # Use stream thumbnail
-    thumbnail_url = fake_stream['thumbnail_url'].replace('{width}', '440').replace('{height}', '248')
-    embed.set_image(url=thumbnail_url)
-    
-    # Get custom color for this server
-    test_color = bot.db.get_embed_color(interaction.guild_id)
-    embed.color = test_color
-    
+    # Create the same embed as real notifications, in this server's custom color
+    embed = build_live_embed(fake_stream)
+    embed.color = embed_color
     embed.set_footer(
         text="🧪 TEST NOTIFICATION - This is a preview",
-        icon_url="https://static.twitchcdn.net/assets/favicon-32-e29e246c157142c94346.png"
+        icon_url=TWITCH_FAVICON_URL
     )
     
     # Create Watch Stream button
-    view = discord.ui.View()
-    view.add_item(discord.ui.Button(
-        label="Watch Stream",
-        url=f"https://twitch.tv/{fake_stream['user_login']}",
-        style=discord.ButtonStyle.link,
-        emoji="🔴"
-    ))
+    view = build_watch_view(fake_stream['user_login'])
     
     try:
         await channel.send(embed=embed, view=view)
@@ -2118,16 +2254,9 @@ async def test_notification(interaction: discord.Interaction):
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="importfile", description="Import multiple streamers from a text file")
 @app_commands.describe(file="Text file with one streamer name per line")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def import_file(interaction: discord.Interaction, file: discord.Attachment):
     """Import streamers from a text file (one per line)"""
-    # Check permissions
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
     # Check if it's a text file
     if not file.filename.endswith('.txt'):
         await interaction.response.send_message(
@@ -2140,16 +2269,10 @@ async def import_file(interaction: discord.Interaction, file: discord.Attachment
     await interaction.response.defer(ephemeral=True)
     
     try:
-        # Download and read the file
-        file_content = await file.read()
-        text = file_content.decode('utf-8')
-        
-        # Split by lines and clean up
-        streamer_names = [
-            line.strip().lower() 
-            for line in text.split('\n') 
-            if line.strip() and not line.strip().startswith('#')
-        ]
+        # Download the file and decode it line by line rather than into one big str;
+        # split by lines and clean up, dropping repeated names (order kept)
+        with io.TextIOWrapper(io.BytesIO(await file.read()), encoding='utf-8') as reader:
+            streamer_names = list(dict.fromkeys(iter_streamer_lines(reader)))
         
         if not streamer_names:
             await interaction.followup.send(
@@ -2169,26 +2292,38 @@ async def import_file(interaction: discord.Interaction, file: discord.Attachment
         failed = []
         already_added = []
         
-        # Process each streamer
+        # Verify streamers exist on Twitch — one /users request per 100 names
+        users = await bot.twitch.get_users_bulk(streamer_names)
+
+        # Split into names found on Twitch and names that weren't
+        verified = []
         for streamer_name in streamer_names:
-            # Verify streamer exists on Twitch
-            user_info = await bot.twitch.get_user(streamer_name)
-            
+            user_info = users.get(streamer_name)
             if not user_info:
                 failed.append(streamer_name)
                 continue
-            
-            # Try to add to database
-            success = bot.db.add_streamer(
-                interaction.guild_id, 
-                user_info['login'], 
-                channel_id
-            )
-            
-            if success:
-                successful.append(user_info['display_name'])
+            verified.append(user_info)
+        
+        # Add every verified streamer in a single transaction
+        added = await asyncio.to_thread(
+            bot.db.add_streamers_bulk,
+            interaction.guild_id,
+            [u['login'] for u in verified],
+            channel_id,
+            {u['login'].lower(): u['id'] for u in verified}
+        )
+        
+        for user_info in verified:
+            display_name = user_info['display_name']
+            if added.get(user_info['login'].lower()):
+                successful.append(display_name)
             else:
-                already_added.append(user_info['display_name'])
+                already_added.append(display_name)
+        
+        # Register EventSub for the new streamers now rather than at the next
+        # (possibly backed-off) periodic sync
+        if successful:
+            asyncio.create_task(bot._sync_eventsub_subscriptions(alert_on_mismatch=False))
         
         # Build response message
         response_parts = []
@@ -2196,19 +2331,19 @@ async def import_file(interaction: discord.Interaction, file: discord.Attachment
         if successful:
             response_parts.append(
                 f"✅ **Successfully added {len(successful)} streamer(s):**\n" +
-                ", ".join(successful)
+                preview_names(successful, 550)
             )
         
         if already_added:
             response_parts.append(
                 f"ℹ️ **Already monitoring {len(already_added)} streamer(s):**\n" +
-                ", ".join(already_added)
+                preview_names(already_added, 550)
             )
         
         if failed:
             response_parts.append(
                 f"❌ **Failed to add {len(failed)} streamer(s)** (not found on Twitch):\n" +
-                ", ".join(failed)
+                preview_names(failed, 550)
             )
         
         # Add summary
@@ -2218,7 +2353,8 @@ async def import_file(interaction: discord.Interaction, file: discord.Attachment
         # Send response
         final_response = "\n\n".join(response_parts)
         
-        # Discord has a 2000 character limit, so truncate if needed
+        # Each list is previewed in at most 550 chars so the summary always fits;
+        # this only guards Discord's 2000 character limit as a last resort
         if len(final_response) > 1900:
             final_response = final_response[:1900] + "\n\n... (response truncated)"
         
@@ -2240,20 +2376,11 @@ async def import_file(interaction: discord.Interaction, file: discord.Attachment
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="color", description="Set the embed color for stream notifications")
 @app_commands.describe(color="Hex color code (e.g., #9146FF, #FF0000, #00FF00)")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def set_color(interaction: discord.Interaction, color: str):
     """Set custom embed color for notifications"""
-    # Check permissions
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
     # Clean up the color input
-    color = color.strip()
-    if color.startswith('#'):
-        color = color[1:]
+    color = color.strip().removeprefix('#').upper()
     
     # Validate hex color
     if len(color) != 6:
@@ -2263,22 +2390,22 @@ async def set_color(interaction: discord.Interaction, color: str):
         )
         return
     
-    try:
-        # Convert hex string to integer
-        color_int = int(color, 16)
-    except ValueError:
+    if not _HEX_COLOR_RE.fullmatch(color):
         await interaction.response.send_message(
             "❌ Invalid hex color. Use only 0-9 and A-F characters (e.g., `#9146FF`)",
             ephemeral=True
         )
         return
     
+    # Convert hex string to integer
+    color_int = int(color, 16)
+    
     # Save to database
     bot.db.set_embed_color(interaction.guild_id, color_int)
     
     await bot.log_to_channel(
         "🎨", "Embed Color Changed",
-        f"**Server:** {interaction.guild.name}\n**New Color:** `#{color.upper()}`\nBy: {interaction.user} (`{interaction.user.id}`)"
+        f"**Server:** {interaction.guild.name}\n**New Color:** `#{color}`\nBy: {interaction.user} (`{interaction.user.id}`)"
     )
     preview_embed = discord.Embed(
         title="Color Updated!",
@@ -2288,7 +2415,7 @@ async def set_color(interaction: discord.Interaction, color: str):
     
     preview_embed.add_field(
         name="Hex Code",
-        value=f"`#{color.upper()}`",
+        value=f"`#{color}`",
         inline=True
     )
     
@@ -2303,16 +2430,9 @@ async def set_color(interaction: discord.Interaction, color: str):
 
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="resetcolor", description="Reset embed color to default Twitch purple")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def reset_color(interaction: discord.Interaction):
     """Reset notification color to default"""
-    # Check permissions
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
     # Reset to Twitch purple
     bot.db.set_embed_color(interaction.guild_id, 0x9146FF)
 
@@ -2333,16 +2453,9 @@ async def reset_color(interaction: discord.Interaction):
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="autodelete", description="Toggle auto-deletion of notifications when streams end")
 @app_commands.describe(enabled="Enable or disable auto-delete")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def auto_delete(interaction: discord.Interaction, enabled: bool):
     """Toggle automatic deletion of notifications when streamers go offline"""
-    # Check permissions
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
     # Save setting
     bot.db.set_auto_delete(interaction.guild_id, enabled)
 
@@ -2383,11 +2496,8 @@ async def auto_delete(interaction: discord.Interaction, enabled: bool):
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="milestonetoggle", description="Toggle milestone notifications at 5 and 10 hours of streaming")
 @app_commands.describe(enabled="Enable or disable milestone notifications")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def milestone_toggle(interaction: discord.Interaction, enabled: bool):
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message("❌ You need 'Manage Server' permission.", ephemeral=True)
-        return
-
     bot.db.set_milestone_notifications(interaction.guild_id, enabled)
 
     embed = discord.Embed(
@@ -2423,6 +2533,7 @@ async def milestone_toggle(interaction: discord.Interaction, enabled: bool):
     hours="Delete messages older than this many hours (minimum 12)",
     keep_pinned="Keep pinned messages (default: Yes)"
 )
+@app_commands.checks.has_permissions(manage_guild=True)
 async def cleanup_set(
     interaction: discord.Interaction,
     channel: discord.TextChannel,
@@ -2430,14 +2541,6 @@ async def cleanup_set(
     keep_pinned: bool = True
 ):
     """Set up automatic cleanup for a channel"""
-    # Check permissions
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
     # Validate hours
     if hours < 12:
         await interaction.response.send_message(
@@ -2498,8 +2601,11 @@ async def cleanup_list(interaction: discord.Interaction):
         color=0x00FF00
     )
     
+    # Every config belongs to this guild — resolve channels against it rather
+    # than bot.get_channel(), which scans every guild the bot is in
+    guild = interaction.guild
     for config in configs:
-        channel_obj = bot.get_channel(config['channel_id'])
+        channel_obj = guild.get_channel_or_thread(config['channel_id'])
         channel_name = channel_obj.mention if channel_obj else f"Unknown Channel ({config['channel_id']})"
         hours = config['interval_hours']
         days = hours // 24
@@ -2520,15 +2626,9 @@ async def cleanup_list(interaction: discord.Interaction):
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="cleanupremove", description="Remove cleanup configuration from a channel")
 @app_commands.describe(channel="Channel to remove cleanup from")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def cleanup_remove(interaction: discord.Interaction, channel: discord.TextChannel):
     """Remove cleanup config"""
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
     success = bot.db.remove_cleanup_config(interaction.guild_id, channel.id)
     
     if success:
@@ -2545,8 +2645,12 @@ async def cleanup_remove(interaction: discord.Interaction, channel: discord.Text
 
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="cleanuptest", description="Preview what would be deleted (doesn't actually delete)")
-@app_commands.describe(channel="Channel to test cleanup on")
-async def cleanup_test(interaction: discord.Interaction, channel: discord.TextChannel):
+@app_commands.describe(
+    channel="Channel to test cleanup on",
+    limit="Messages to check (default 1000, max 1000; fewer is faster)"
+)
+async def cleanup_test(interaction: discord.Interaction, channel: discord.TextChannel,
+                       limit: app_commands.Range[int, 1, 1000] = 1000):
     """Test cleanup without actually deleting"""
     config = bot.db.get_cleanup_config(interaction.guild_id, channel.id)
     
@@ -2560,15 +2664,12 @@ async def cleanup_test(interaction: discord.Interaction, channel: discord.TextCh
     
     await interaction.response.defer(ephemeral=True)
     
-    # Count messages that would be deleted
-    cutoff_time = datetime.utcnow() - timedelta(hours=config['interval_hours'])
-    count = 0
+    # Fetch the messages older than the cutoff (Discord returns 100 per request),
+    # then count the ones that would be deleted
+    cutoff_time = discord.utils.utcnow() - timedelta(hours=config['interval_hours'])
     
     try:
-        async for message in channel.history(limit=1000, before=cutoff_time):
-            if config['keep_pinned'] and message.pinned:
-                continue
-            count += 1
+        messages = [m async for m in channel.history(limit=limit, before=cutoff_time)]
     except discord.Forbidden:
         await interaction.followup.send(
             f"❌ I don't have permission to read message history in {channel.mention}",
@@ -2576,13 +2677,20 @@ async def cleanup_test(interaction: discord.Interaction, channel: discord.TextCh
         )
         return
     
+    if config['keep_pinned']:
+        count = sum(1 for m in messages if not m.pinned)
+    else:
+        count = len(messages)
+    requests_made = max(1, -(-len(messages) // 100))
+    
     hours = config['interval_hours']
     days = hours // 24
     
     await interaction.followup.send(
         f"🧪 **Test Results for {channel.mention}**\n\n"
         f"**Messages that would be deleted:** {count}\n"
-        f"(Checked last 1000 messages older than {hours} hours / {days} day{'s' if days != 1 else ''})\n\n"
+        f"(Checked {len(messages)} of up to {limit} messages older than {hours} hours / {days} day{'s' if days != 1 else ''}"
+        f" in {requests_made} request{'s' if requests_made != 1 else ''})\n\n"
         f"**Keep pinned messages:** {'Yes' if config['keep_pinned'] else 'No'}\n\n"
         f"ℹ️ This is a preview only - no messages were deleted.",
         ephemeral=True
@@ -2785,16 +2893,12 @@ async def bot_info(interaction: discord.Interaction):
         )
         return
     
-    # Get all servers bot is in
-    guild_count = len(bot.guilds)
-    
-    # Get total streamers being monitored
-    all_streamers = bot.db.get_all_streamers()
-    unique_streamers = len(set(s['streamer_name'] for s in all_streamers))
-    total_configs = len(all_streamers)
+    # Get all servers bot is in (bot.guilds builds a new list on every access)
+    guilds = bot.guilds
+    guild_count = len(guilds)
     
-    # Get cleanup configs
-    cleanup_configs = bot.db.get_all_cleanup_configs()
+    # Get streamer and cleanup counts in one query
+    unique_streamers, _, total_configs, cleanup_count = await asyncio.to_thread(bot.db.get_streamer_stats)
     
     # Create embed
     embed = discord.Embed(
@@ -2822,24 +2926,24 @@ async def bot_info(interaction: discord.Interaction):
     
     embed.add_field(
         name="🗑️ Cleanup Channels",
-        value=f"{len(cleanup_configs)} configured",
+        value=f"{cleanup_count} configured",
         inline=True
     )
     
     embed.add_field(
         name="💾 Memory Usage",
-        value=f"{round(psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024, 1)} MB",
+        value=f"{round(bot.process.memory_info().rss / (1 << 20), 1)} MB",
         inline=True
     )
     
     embed.add_field(
         name="⏱️ Uptime",
-        value=f"{(datetime.utcnow() - bot.start_time).days} days",
+        value=f"{int(time.monotonic() - bot.start_monotonic) // 86400} days",
         inline=True
     )
     
     # List servers
-    server_list = "\n".join([f"• {guild.name} ({guild.id})" for guild in bot.guilds])
+    server_list = "\n".join([f"• {guild.name} ({guild.id})" for guild in guilds])
     if len(server_list) > 1024:
         server_list = server_list[:1020] + "..."
     
@@ -2889,7 +2993,7 @@ async def server_details(interaction: discord.Interaction, server_id: str = None
     
     # Notification channel
     notif_channel_id = bot.db.get_notification_channel(guild_id)
-    notif_channel = bot.get_channel(notif_channel_id) if notif_channel_id else None
+    notif_channel = guild.get_channel_or_thread(notif_channel_id) if notif_channel_id else None
     
     embed.add_field(
         name="🔔 Notification Channel",
@@ -2919,7 +3023,7 @@ async def server_details(interaction: discord.Interaction, server_id: str = None
     if cleanup_configs:
         cleanup_list = []
         for config in cleanup_configs[:5]:
-            channel = bot.get_channel(config['channel_id'])
+            channel = guild.get_channel_or_thread(config['channel_id'])
             channel_name = channel.mention if channel else f"Unknown ({config['channel_id']})"
             cleanup_list.append(f"• {channel_name}: {config['interval_hours']}h")
         
@@ -2941,20 +3045,13 @@ async def server_details(interaction: discord.Interaction, server_id: str = None
     streamer="Twitch streamer username",
     channel="Channel to send notification to (optional, uses notification channel if not specified)"
 )
+@app_commands.checks.has_permissions(manage_guild=True)
 async def manual_notif(
     interaction: discord.Interaction,
     streamer: str,
     channel: discord.TextChannel = None
 ):
     """Manually send a notification for a streamer"""
-    # Check permissions
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-    
     await interaction.response.defer(ephemeral=True)
     
     # Get streamer info from Twitch
@@ -2968,34 +3065,38 @@ async def manual_notif(
         )
         return
     
+    login = user_info['login']
+    display_name = user_info['display_name']
+    
     # Get stream info
-    streams = await bot.twitch.get_live_streams([user_info['login']])
+    streams = await bot.twitch.get_live_streams([login])
     
     if not streams:
         await interaction.followup.send(
-            f"ℹ️ {user_info['display_name']} is not currently live.\n"
+            f"ℹ️ {display_name} is not currently live.\n"
             f"Sending notification anyway with placeholder data...",
             ephemeral=True
         )
         
         # Create fake stream data
         stream = {
-            'user_name': user_info['display_name'],
-            'user_login': user_info['login'],
+            'user_name': display_name,
+            'user_login': login,
             'title': 'Live Stream',
             'game_name': 'Just Chatting',
             'viewer_count': 0,
-            'thumbnail_url': f"https://static-cdn.jtvnw.net/previews-ttv/live_user_{user_info['login']}-{{width}}x{{height}}.jpg",
+            'thumbnail_url': f"https://static-cdn.jtvnw.net/previews-ttv/live_user_{login}-{{width}}x{{height}}.jpg",
             'profile_image_url': user_info.get('profile_image_url', '')
         }
     else:
         stream = streams[0]
     
+    # Notification channel, color and ping role in one settings lookup
+    channel_id, embed_color, ping_role_id = bot.db.get_notification_settings(interaction.guild_id)
+    
     # Use specified channel or notification channel
-    if not channel:
-        channel_id = bot.db.get_notification_channel(interaction.guild_id)
-        if channel_id:
-            channel = bot.get_channel(channel_id)
+    if not channel and channel_id:
+        channel = interaction.guild.get_channel_or_thread(channel_id)
     
     if not channel:
         await interaction.followup.send(
@@ -3004,69 +3105,28 @@ async def manual_notif(
         )
         return
     
-    # Get custom color
-    embed_color = bot.db.get_embed_color(interaction.guild_id)
-    
-    # Create embed
-    embed = discord.Embed(
-        title=stream['title'],
-        url=f"https://twitch.tv/{stream['user_login']}",
-        description=f"**{stream['user_name']}** is now live!",
-        color=embed_color,
-        timestamp=datetime.utcnow()
-    )
-    
-    embed.set_author(
-        name=stream['user_name'],
-        url=f"https://twitch.tv/{stream['user_login']}",
-        icon_url=stream.get('profile_image_url', '')
-    )
-    
-    embed.add_field(
-        name="Game",
-        value=stream['game_name'] or "No category",
-        inline=True
-    )
-    
-    embed.add_field(
-        name="Viewers",
-        value=str(stream['viewer_count']),
-        inline=True
-    )
-    
-    thumbnail_url = stream['thumbnail_url'].replace('{width}', '440').replace('{height}', '248')
-    embed.set_image(url=thumbnail_url)
-    
-    embed.set_footer(
-        text="Twitch",
-        icon_url="https://static.twitchcdn.net/assets/favicon-32-e29e246c157142c94346.png"
-    )
+    # Create the same embed as real notifications, in this server's custom color
+    embed = build_live_embed(stream)
+    embed.color = embed_color
     
     # Add Watch Stream button
-    view = discord.ui.View()
-    view.add_item(discord.ui.Button(
-        label="Watch Stream",
-        url=f"https://twitch.tv/{stream['user_login']}",
-        style=discord.ButtonStyle.link,
-        emoji="🔴"
-    ))
+    view = build_watch_view(login)
     
     # Send notification
     try:
-        ping_role_id = bot.db.get_ping_role(interaction.guild_id)
         ping_content = f"<@&{ping_role_id}>" if ping_role_id else None
         message = await channel.send(content=ping_content, embed=embed, view=view)
 
         # Always save message ID (auto-delete checks flag at delete time)
         bot.db.save_notification_message(
             interaction.guild_id,
-            stream['user_login'],
+            login,
             channel.id,
             message.id
         )
 
         await interaction.followup.send(
-            f"✅ Manual notification sent for {stream['user_name']} to {channel.mention}",
+            f"✅ Manual notification sent for {display_name} to {channel.mention}",
             ephemeral=True
         )
     except Exception as e:
@@ -3078,15 +3138,9 @@ async def manual_notif(
 
 @app_commands.default_permissions(manage_guild=True)
 @bot.tree.command(name="repostlive", description="Re-send notifications for all currently live monitored streamers")
+@app_commands.checks.has_permissions(manage_guild=True)
 async def repost_live(interaction: discord.Interaction):
     """Check all monitored streamers, send notifications for any currently live that haven't been notified yet."""
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
-            "❌ You need 'Manage Server' permission to use this command.",
-            ephemeral=True
-        )
-        return
-
     await interaction.response.defer(ephemeral=True)
 
     streamers = bot.db.get_server_streamers(interaction.guild_id)
@@ -3104,14 +3158,16 @@ async def repost_live(interaction: discord.Interaction):
     # Get all server streamers as a lookup
     streamer_lookup = {s['streamer_name'].lower(): s for s in streamers}
 
-    sent = []
-    skipped = []
+    # Helix logins are lowercase, like the lookup keys
+    live_streams = [s for s in live_streams if s['user_login'] in streamer_lookup]
+
+    # Profile images for every live streamer in one lookup
+    users = await bot.twitch.get_users_bulk([s['user_login'] for s in live_streams])
 
+    sends = []
     for stream in live_streams:
-        streamer_name = stream['user_login'].lower()
-        server_data = streamer_lookup.get(streamer_name)
-        if not server_data:
-            continue
+        streamer_name = stream['user_login']
+        server_data = streamer_lookup[streamer_name]
 
         # Build server_data in the format send_notification expects
         notif_data = {
@@ -3120,16 +3176,20 @@ async def repost_live(interaction: discord.Interaction):
             'channel_id': server_data.get('custom_channel_id') or server_data['channel_id'],
         }
 
-        # Fetch profile image
-        user_info = await bot.twitch.get_user(streamer_name)
+        user_info = users.get(streamer_name)
         if user_info:
             stream['profile_image_url'] = user_info.get('profile_image_url', '')
 
-        await bot.send_notification(notif_data, stream)
+        sends.append(bot._send_notification_bounded(notif_data, stream))
 
         # Also mark as live so polling loop doesn't double notify
-        bot.live_streamers.add(streamer_name)
-        sent.append(stream['user_name'])
+        bot._mark_live(streamer_name)
+
+    # Sends are independent; send_notification logs its own failures and
+    # _send_notification_bounded records each delivered message
+    await asyncio.gather(*sends, return_exceptions=True)
+
+    sent = [stream['user_name'] for stream in live_streams]
 
     if sent:
         await interaction.followup.send(
@@ -3149,12 +3209,8 @@ async def repost_live(interaction: discord.Interaction):
     streamer="Twitch username to check",
     limit="Number of entries to show (default 10, max 25)"
 )
-async def notif_log(interaction: discord.Interaction, streamer: str, limit: int = 10):
-    if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message("❌ You need 'Manage Server' permission.", ephemeral=True)
-        return
-
-    limit = max(1, min(limit, 25))
+@app_commands.checks.has_permissions(manage_guild=True)
+async def notif_log(interaction: discord.Interaction, streamer: str, limit: app_commands.Range[int, 1, 25] = 10):
     streamer = streamer.lower().strip().lstrip("@")
     logs = bot.db.get_notification_log(interaction.guild_id, streamer, limit)
 
@@ -3166,7 +3222,7 @@ async def notif_log(interaction: discord.Interaction, streamer: str, limit: int
     else:
         lines_out = []
         for entry in logs:
-            channel = bot.get_channel(entry['channel_id'])
+            channel = interaction.guild.get_channel_or_thread(entry['channel_id'])
             channel_str = f"<#{entry['channel_id']}>" if channel else f"`#{entry['channel_id']}`"
             status_emoji = "✅" if entry['status'] == 'sent' else "❌"
             lines_out.append(f"{status_emoji} `{entry['sent_at']}` → {channel_str}")
@@ -3180,7 +3236,7 @@ async def leaderboard(interaction: discord.Interaction):
     """Show the monthly leaderboard for this server"""
     rows = bot.db.get_server_leaderboard(interaction.guild_id, limit=10)
     
-    now = datetime.utcnow()
+    now = discord.utils.utcnow()
     month_name = now.strftime("%B %Y")
     
     embed = discord.Embed(
@@ -3198,7 +3254,7 @@ async def leaderboard(interaction: discord.Interaction):
             medal = medals[i] if i < 3 else f"{i+1}."
             streams = row["stream_count"]
             name = row["streamer_name"]
-            lines.append(f"{medal} [{name}](https://twitch.tv/{name}) — {streams} stream{'s' if streams != 1 else ''}")
+            lines.append(f"{medal} [{name}]({TWITCH_BASE}{name}) — {streams} stream{'s' if streams != 1 else ''}")
         embed.add_field(name="Rankings", value="\n".join(lines), inline=False)
     
     embed.set_footer(text="Resets on the 1st of each month")
@@ -3219,7 +3275,7 @@ async def global_leaderboard(interaction: discord.Interaction):
 
     rows = bot.db.get_global_leaderboard(limit=15)
     
-    now = datetime.utcnow()
+    now = discord.utils.utcnow()
     month_name = now.strftime("%B %Y")
     
     embed = discord.Embed(
@@ -3238,7 +3294,7 @@ async def global_leaderboard(interaction: discord.Interaction):
             name = row["streamer_name"]
             streams = row["total_streams"]
             servers = row["server_count"]
-            lines.append(f"{medal} [{name}](https://twitch.tv/{name}) — {streams} stream{'s' if streams != 1 else ''} across {servers} server{'s' if servers != 1 else ''}")
+            lines.append(f"{medal} [{name}]({TWITCH_BASE}{name}) — {streams} stream{'s' if streams != 1 else ''} across {servers} server{'s' if servers != 1 else ''}")
 
         # Split into fields if over 1024 char limit
         current_field = []
@@ -3275,58 +3331,44 @@ async def db_stats(interaction: discord.Interaction):
 
     await interaction.response.defer(ephemeral=True)
 
-    conn = bot.db.get_connection()
-    cursor = conn.cursor()
-
-    # Core tables
-    cursor.execute("SELECT COUNT(DISTINCT guild_id) FROM server_settings")
-    servers_configured = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(DISTINCT guild_id) FROM monitored_streamers")
-    servers_with_streamers = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM monitored_streamers")
-    total_streamer_rows = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(DISTINCT streamer_name) FROM monitored_streamers")
-    unique_streamers = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM notification_messages")
-    saved_notif_messages = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM cleanup_configs")
-    cleanup_configs = cursor.fetchone()[0]
-
-    # Leaderboard tables
-    cursor.execute("SELECT COUNT(*) FROM stream_events WHERE strftime('%Y-%m', went_live_at) = strftime('%Y-%m', 'now')")
-    stream_events_this_month = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM global_stream_events WHERE strftime('%Y-%m', went_live_at) = strftime('%Y-%m', 'now')")
-    global_events_this_month = cursor.fetchone()[0]
-
-    # Twitch chat bot tables
-    cursor.execute("SELECT COUNT(*) FROM twitch_channels")
-    twitch_channels = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM twitch_commands")
-    twitch_commands = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(DISTINCT twitch_channel) FROM twitch_commands")
-    channels_with_commands = cursor.fetchone()[0]
-
-    # Top 5 most monitored streamers
-    cursor.execute('''
-        SELECT streamer_name, COUNT(DISTINCT guild_id) as server_count
-        FROM monitored_streamers
-        GROUP BY streamer_name
-        ORDER BY server_count DESC
-        LIMIT 5
-    ''')
-    top_streamers = cursor.fetchall()
-
-    conn.close()
-
-    now = datetime.utcnow()
+    def _read_stats():
+        conn = bot.db.get_connection()
+        cursor = conn.cursor()
+        # Every count in one statement: the monitored_streamers aggregates in a single
+        # scan, the rest as scalar subqueries
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(DISTINCT guild_id) FROM server_settings),
+                COUNT(DISTINCT guild_id), COUNT(*), COUNT(DISTINCT streamer_name),
+                (SELECT COUNT(*) FROM notification_messages),
+                (SELECT COUNT(*) FROM cleanup_configs),
+                (SELECT COUNT(*) FROM stream_events WHERE strftime('%Y-%m', went_live_at) = strftime('%Y-%m', 'now')),
+                (SELECT COUNT(*) FROM global_stream_events WHERE strftime('%Y-%m', went_live_at) = strftime('%Y-%m', 'now')),
+                (SELECT COUNT(*) FROM twitch_channels),
+                (SELECT COUNT(*) FROM twitch_commands),
+                (SELECT COUNT(DISTINCT twitch_channel) FROM twitch_commands)
+            FROM monitored_streamers
+        ''')
+        counts = cursor.fetchone()
+
+        # Top 5 most monitored streamers
+        cursor.execute('''
+            SELECT streamer_name, COUNT(DISTINCT guild_id) as server_count
+            FROM monitored_streamers
+            GROUP BY streamer_name
+            ORDER BY server_count DESC
+            LIMIT 5
+        ''')
+        top = cursor.fetchall()
+        conn.close()
+        return counts, top
+
+    counts, top_streamers = await asyncio.to_thread(_read_stats)
+    (servers_configured, servers_with_streamers, total_streamer_rows, unique_streamers,
+     saved_notif_messages, cleanup_configs, stream_events_this_month, global_events_this_month,
+     twitch_channels, twitch_commands, channels_with_commands) = counts
+
+    now = discord.utils.utcnow()
     month_name = now.strftime("%B %Y")
 
     embed = discord.Embed(
@@ -3441,7 +3483,14 @@ async def main_with_error_handling():
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main_with_error_handling())
+    # uvloop is a faster drop-in event loop; fall back to stock asyncio where
+    # it isn't available (e.g. Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main_with_error_handling())
+    else:
+        uvloop.run(main_with_error_handling())
 
 
 # ExcelProtocol — Copyright (c) 2026 stayexcellent. All rights reserved.
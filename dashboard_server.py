@@ -111,19 +111,22 @@ _eventsub_seen: dict = {}
 # Bot reference — set by create_dashboard_app() so we can reload views
 _bot_ref = None
 
+
+def _invalidate_bot_streamers():
+    """Drop the bot's cached streamer list after writing monitored_streamers directly."""
+    if _bot_ref:
+        _bot_ref.db.invalidate_streamers()
+
 # ── DB Helper ─────────────────────────────────────────────────────────────────
 async def db_fetch(query: str, params: tuple = ()):
     async with aiosqlite.connect(DB_PATH, timeout=30) as db:
-        await db.execute("PRAGMA journal_mode=WAL")
-        await db.execute("PRAGMA busy_timeout=30000")
         db.row_factory = aiosqlite.Row
         async with db.execute(query, params) as cursor:
             return [dict(r) for r in await cursor.fetchall()]
 
 async def db_execute(query: str, params: tuple = ()):
     async with aiosqlite.connect(DB_PATH, timeout=30) as db:
-        await db.execute("PRAGMA journal_mode=WAL")
-        await db.execute("PRAGMA busy_timeout=30000")
+        await db.execute("PRAGMA synchronous=NORMAL")
         await db.execute(query, params)
         await db.commit()
 
@@ -554,12 +557,11 @@ async def get_guild_summary(request):
     # Enrich streamers with Twitch data + channel names
     usernames = [s["twitch_username"] for s in streamers_raw]
     twitch_data = await get_twitch_users(usernames)
-    eff_channel_ids = list({str(s.get("custom_channel_id") or s["channel_id"]) for s in streamers_raw})
-    for rr in reaction_roles_raw:
-        eff_channel_ids.append(str(rr["channel_id"]))
+    eff_channel_ids = dict.fromkeys(str(s.get("custom_channel_id") or s["channel_id"]) for s in streamers_raw)
+    eff_channel_ids.update(dict.fromkeys(str(rr["channel_id"]) for rr in reaction_roles_raw))
 
     channel_names = {}
-    for cid in set(eff_channel_ids):
+    for cid in eff_channel_ids:
         channel_names[cid] = await get_channel_name(cid)
 
     streamers = []
@@ -673,6 +675,7 @@ async def add_streamer(request):
             "INSERT INTO monitored_streamers (guild_id, streamer_name, channel_id, twitch_user_id) VALUES (?, ?, ?, ?)",
             (guild_id, twitch_username, channel_id, user_info["id"] if user_info else None),
         )
+        _invalidate_bot_streamers()
     except Exception as e:
         if "UNIQUE" in str(e):
             raise web.HTTPConflict(reason="Streamer already tracked")
@@ -702,7 +705,9 @@ async def delete_streamer(request):
         "DELETE FROM monitored_streamers WHERE guild_id = ? AND streamer_name = ?",
         (guild_id, username.lower()),
     )
+    _invalidate_bot_streamers()
     if _bot_ref:
+        asyncio.create_task(_bot_ref._unregister_eventsub_if_unused(username))
         await _bot_ref.log_to_channel(
             "➖", "Streamer Removed (Dashboard)",
             f"**{username}** removed from guild `{guild_id}`"
@@ -961,6 +966,7 @@ async def edit_streamer(request):
         "UPDATE monitored_streamers SET custom_channel_id = ? WHERE guild_id = ? AND streamer_name = ?",
         (channel_id, guild_id, username.lower()),
     )
+    _invalidate_bot_streamers()
     # Clear stale permission issues — next check will re-evaluate with new channel
     await db_execute("DELETE FROM permission_issues WHERE guild_id = ?", (guild_id,))
     return web.json_response({"ok": True})
@@ -1267,6 +1273,9 @@ async def patch_server_settings(request):
             "UPDATE monitored_streamers SET channel_id = ? WHERE guild_id = ? AND custom_channel_id IS NULL",
             (cid, guild_id)
         )
+        _invalidate_bot_streamers()
+        if _bot_ref:
+            _bot_ref.db.invalidate_notification_channel(int(guild_id))
         # Clear stale permission issues — next periodic check will re-evaluate current channels
         await db_execute("DELETE FROM permission_issues WHERE guild_id = ?", (guild_id,))
 
@@ -1277,6 +1286,8 @@ async def patch_server_settings(request):
             "INSERT INTO server_settings (guild_id, notification_channel_id, embed_color) VALUES (?, 0, ?) ON CONFLICT(guild_id) DO UPDATE SET embed_color = ?",
             (guild_id, color_int, color_int)
         )
+        if _bot_ref:
+            _bot_ref.db.invalidate_embed_color(int(guild_id))
 
     if "auto_delete_notifications" in body:
         val = 1 if body["auto_delete_notifications"] else 0
@@ -1284,6 +1295,8 @@ async def patch_server_settings(request):
             "INSERT INTO server_settings (guild_id, notification_channel_id, auto_delete_notifications) VALUES (?, 0, ?) ON CONFLICT(guild_id) DO UPDATE SET auto_delete_notifications = ?",
             (guild_id, val, val)
         )
+        if _bot_ref:
+            _bot_ref.db.invalidate_auto_delete(int(guild_id))
 
     if "milestone_notifications" in body:
         val = 1 if body["milestone_notifications"] else 0
@@ -1298,6 +1311,8 @@ async def patch_server_settings(request):
             "INSERT INTO birthday_channels (guild_id, channel_id) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET channel_id = ?",
             (guild_id, cid, cid)
         )
+        if _bot_ref:
+            _bot_ref.db.invalidate_birthday_channel(int(guild_id))
 
     if "ping_role_id" in body:
         raw = body["ping_role_id"]
@@ -1320,6 +1335,8 @@ async def patch_server_settings(request):
                 "INSERT INTO server_settings (guild_id, notification_channel_id, ping_role_id) VALUES (?, 0, ?) ON CONFLICT(guild_id) DO UPDATE SET ping_role_id = ?",
                 (guild_id, rid, rid)
             )
+        if _bot_ref:
+            _bot_ref.db.invalidate_ping_role(int(guild_id))
 
     return web.json_response({"ok": True})
 
@@ -2702,6 +2719,8 @@ async def db_tools_action(request):
             if clean and clean != raw:
                 await db_execute("UPDATE monitored_streamers SET streamer_name = ? WHERE rowid = ?", (clean, r["rowid"]))
                 fixed += 1
+        if fixed:
+            _invalidate_bot_streamers()
         return web.json_response({"ok": True, "message": f"Fixed {fixed} bad streamer name(s)."})
 
     elif action == "trim_notification_log":
@@ -2713,7 +2732,8 @@ async def db_tools_action(request):
         if _bot_ref:
             count = len(_bot_ref.live_streamers)
             _bot_ref.live_streamers.clear()
-            return web.json_response({"ok": True, "message": f"Cleared {count} live_streamers from memory."})
+            _bot_ref.db.clear_stream_live()
+            return web.json_response({"ok": True, "message": f"Cleared {count} live_streamers from memory and the database."})
         return web.json_response({"ok": False, "message": "Bot not available."})
 
     elif action == "sync_eventsub":
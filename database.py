@@ -1,10 +1,15 @@
 import sqlite3
 import logging
 import os
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Seconds a get_all_streamers() snapshot is trusted; writes invalidate it sooner,
+# this only bounds how long a write made outside the bot and dashboard goes unseen
+STREAMERS_CACHE_TTL = 300
+
 class Database:
     def __init__(self, db_path=None):
         # Use /data volume on Fly.io if available, otherwise local
@@ -15,7 +20,32 @@ class Database:
                 db_path = 'twitch_bot.db'
         
         self.db_path = db_path
-        
+
+        # In-memory cache of birthday announcement channels, keyed by guild_id.
+        # Populated lazily on read and invalidated on every write path.
+        self._birthday_channel_cache: Dict[int, Optional[int]] = {}
+
+        # Snapshot of get_all_streamers() (plus a per-login index over it) and
+        # per-guild embed colours, read on every
+        # stream notification. Invalidated by the write paths below; the dashboard
+        # writes through its own connection and calls the invalidate_* methods.
+        # The snapshot is also refreshed after STREAMERS_CACHE_TTL seconds.
+        # Rebuilds can run in worker threads, so each invalidation bumps a
+        # generation and a rebuild that raced with one is not stored.
+        self._streamers_cache: Optional[List[Dict]] = None
+        self._streamers_cached_at = 0.0
+        self._streamers_generation = 0
+        self._streamers_by_login: Optional[Dict[str, List[Dict]]] = None
+        self._embed_color_cache: Dict[int, int] = {}
+
+        # Per-guild auto-delete flag and ping role, read on every notification send
+        # and stream.offline; same invalidation rules as the embed colour cache.
+        self._auto_delete_cache: Dict[int, bool] = {}
+        self._ping_role_cache: Dict[int, Optional[int]] = {}
+
+        # Per-guild notification channel, read by most slash commands; same rules.
+        self._notification_channel_cache: Dict[int, Optional[int]] = {}
+
         # Ensure directory exists
         db_dir = os.path.dirname(self.db_path)
         if db_dir and not os.path.exists(db_dir):
@@ -24,15 +54,24 @@ class Database:
         self.init_database()
     
     def get_connection(self):
-        """Create a database connection with WAL mode and busy timeout."""
+        """Create a database connection.
+
+        journal_mode=WAL is persisted in the database file by init_database, and
+        timeout=30 already sets the busy timeout, so only per-connection pragmas
+        are issued here. synchronous=NORMAL is durable under WAL and skips the
+        fsync on every commit.
+        """
         conn = sqlite3.connect(self.db_path, timeout=30)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         return conn
     
     def init_database(self):
         """Initialize database tables"""
         conn = self.get_connection()
+        # WAL is a property of the database file, so setting it once here
+        # covers every later connection (including the dashboard's)
+        conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
         
         # Table for server settings
@@ -298,6 +337,12 @@ class Database:
             )
         ''')
 
+        # The daily run looks birthdays up by date across all guilds
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_birthdays_month_day
+            ON birthdays(month, day)
+        ''')
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS birthday_channels (
                 guild_id   INTEGER PRIMARY KEY,
@@ -305,6 +350,24 @@ class Database:
             )
         ''')
 
+        # Small key/value store for scheduler state that must survive restarts
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bot_meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+
+        # Streamers currently live, keyed by the broadcast they were notified for,
+        # so restarts and repeated stream.online deliveries don't re-notify
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS live_streams (
+                streamer_name TEXT PRIMARY KEY,
+                started_at    TEXT NOT NULL,
+                notified_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
         # Add milestone_notifications column if it doesn't exist (migration)
         cursor.execute('''
             SELECT COUNT(*) FROM pragma_table_info('server_settings')
@@ -753,6 +816,7 @@ class Database:
             ''', (guild_id, streamer_name.lower(), channel_id, custom_channel_id, twitch_user_id))
             
             conn.commit()
+            self.invalidate_streamers()
             logger.info(f"Added streamer {streamer_name} for guild {guild_id} (custom channel: {custom_channel_id})")
             return True
         
@@ -763,6 +827,43 @@ class Database:
         finally:
             conn.close()
     
+    def add_streamers_bulk(self, guild_id: int, streamer_names: List[str], channel_id: int,
+                           user_ids: Optional[Dict[str, str]] = None) -> Dict[str, bool]:
+        """
+        Add many streamers to a guild in a single transaction.
+        user_ids: optional {lowercase login: Twitch user ID}, stored like add_streamer's twitch_user_id.
+        Returns {streamer_name: True if added, False if already monitored}.
+        """
+        user_ids = user_ids or {}
+        names = list(dict.fromkeys(name.lower() for name in streamer_names))
+        if not names:
+            return {}
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        placeholders = ','.join('?' * len(names))
+        cursor.execute(
+            f'SELECT streamer_name FROM monitored_streamers WHERE guild_id = ? AND streamer_name IN ({placeholders})',
+            [guild_id, *names]
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        to_add = [name for name in names if name not in existing]
+
+        cursor.executemany('''
+            INSERT OR IGNORE INTO monitored_streamers (guild_id, streamer_name, channel_id, twitch_user_id)
+            VALUES (?, ?, ?, ?)
+        ''', [(guild_id, name, channel_id, user_ids.get(name)) for name in to_add])
+
+        conn.commit()
+        conn.close()
+
+        if to_add:
+            self.invalidate_streamers()
+            logger.info(f"Bulk added {len(to_add)} streamer(s) for guild {guild_id}")
+
+        return {name: name not in existing for name in names}
+
     def remove_streamer(self, guild_id: int, streamer_name: str) -> bool:
         """
         Remove a streamer from monitoring
@@ -781,6 +882,7 @@ class Database:
         conn.close()
         
         if removed:
+            self.invalidate_streamers()
             logger.info(f"Removed streamer {streamer_name} from guild {guild_id}")
         
         return removed
@@ -813,6 +915,9 @@ class Database:
     
     def get_all_streamers(self) -> List[Dict]:
         """Get all monitored streamers across all servers"""
+        if self._streamers_fresh():
+            return list(self._streamers_cache)
+        generation = self._streamers_generation
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -825,7 +930,7 @@ class Database:
         rows = cursor.fetchall()
         conn.close()
         
-        return [
+        streamers = [
             {
                 'guild_id': row[0],
                 'streamer_name': row[1],
@@ -835,6 +940,35 @@ class Database:
             }
             for row in rows
         ]
+        # An invalidation during the read means these rows may predate a write
+        if generation == self._streamers_generation:
+            self._streamers_cache = streamers
+            self._streamers_cached_at = time.monotonic()
+            self._streamers_by_login = None
+        return list(streamers)
+
+    def _streamers_fresh(self) -> bool:
+        """Whether the get_all_streamers() snapshot exists and is within STREAMERS_CACHE_TTL"""
+        return (self._streamers_cache is not None
+                and time.monotonic() - self._streamers_cached_at < STREAMERS_CACHE_TTL)
+
+    def get_servers_for_streamer(self, streamer_name: str) -> List[Dict]:
+        """Get the monitored-streamer rows for one login, from an index over the cached snapshot"""
+        index = self._streamers_by_login
+        if index is None or not self._streamers_fresh():
+            generation = self._streamers_generation
+            index = {}
+            for s in self.get_all_streamers():
+                index.setdefault(s['streamer_name'].lower(), []).append(s)
+            if generation == self._streamers_generation:
+                self._streamers_by_login = index
+        return list(index.get(streamer_name.lower(), ()))
+
+    def invalidate_streamers(self):
+        """Drop the cached get_all_streamers() snapshot (for writers that bypass this class)."""
+        self._streamers_generation += 1
+        self._streamers_cache = None
+        self._streamers_by_login = None
 
     def update_streamer_user_id(self, guild_id: int, streamer_name: str, twitch_user_id: str):
         """Store the Twitch user ID for a monitored streamer."""
@@ -846,6 +980,7 @@ class Database:
         )
         conn.commit()
         conn.close()
+        self.invalidate_streamers()
 
     def update_streamer_login(self, old_login: str, new_login: str):
         """Update streamer_name across all guilds when a Twitch user renames."""
@@ -858,6 +993,7 @@ class Database:
         affected = cursor.rowcount
         conn.commit()
         conn.close()
+        self.invalidate_streamers()
         return affected
 
     def get_streamers_missing_user_id(self) -> List[Dict]:
@@ -873,6 +1009,19 @@ class Database:
         conn.close()
         return [{'streamer_name': r[0]} for r in rows]
 
+    def get_streamer_stats(self) -> Tuple[int, int, int, int]:
+        """Return (unique streamers, servers monitoring any, total monitoring rows, cleanup configs) in one query."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(DISTINCT streamer_name), COUNT(DISTINCT guild_id), COUNT(*),
+                   (SELECT COUNT(*) FROM cleanup_configs)
+            FROM monitored_streamers
+        ''')
+        row = cursor.fetchone()
+        conn.close()
+        return row[0], row[1], row[2], row[3]
+
     def get_all_streamers_with_ids(self) -> List[Dict]:
         """Return all unique (streamer_name, twitch_user_id) pairs that have an ID stored."""
         conn = self.get_connection()
@@ -909,10 +1058,14 @@ class Database:
         
         conn.commit()
         conn.close()
+        self._notification_channel_cache[guild_id] = channel_id
+        self.invalidate_streamers()
         logger.info(f"Set notification channel for guild {guild_id} to {channel_id} (updated {updated_streamers} streamers)")
     
     def get_notification_channel(self, guild_id: int) -> Optional[int]:
         """Get the notification channel for a server"""
+        if guild_id in self._notification_channel_cache:
+            return self._notification_channel_cache[guild_id]
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -925,7 +1078,13 @@ class Database:
         row = cursor.fetchone()
         conn.close()
         
-        return row[0] if row else None
+        channel_id = row[0] if row else None
+        self._notification_channel_cache[guild_id] = channel_id
+        return channel_id
+
+    def invalidate_notification_channel(self, guild_id: int):
+        """Drop a guild's cached notification channel (for writers that bypass set_notification_channel)."""
+        self._notification_channel_cache.pop(guild_id, None)
     
     def set_embed_color(self, guild_id: int, color: int):
         """Set the embed color for a server (as hex integer)"""
@@ -941,10 +1100,13 @@ class Database:
         
         conn.commit()
         conn.close()
+        self._embed_color_cache[guild_id] = color or 0x00FFFF
         logger.info(f"Set embed color for guild {guild_id} to {hex(color)}")
     
     def get_embed_color(self, guild_id: int) -> int:
         """Get the embed color for a server (returns hex integer)"""
+        if guild_id in self._embed_color_cache:
+            return self._embed_color_cache[guild_id]
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -958,7 +1120,33 @@ class Database:
         conn.close()
         
         # Return custom color or default Twitch purple
-        return row[0] if row and row[0] else 0x00FFFF
+        color = row[0] if row and row[0] else 0x00FFFF
+        self._embed_color_cache[guild_id] = color
+        return color
+
+    def get_embed_colors_bulk(self, guild_ids: List[int]) -> Dict[int, int]:
+        """Get embed colors for many servers at once, querying only the uncached ones."""
+        colors = {gid: self._embed_color_cache[gid] for gid in guild_ids if gid in self._embed_color_cache}
+        missing = list({gid for gid in guild_ids if gid not in colors})
+        if missing:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            placeholders = ','.join('?' * len(missing))
+            cursor.execute(
+                f'SELECT guild_id, embed_color FROM server_settings WHERE guild_id IN ({placeholders})',
+                missing
+            )
+            found = {row[0]: row[1] for row in cursor.fetchall()}
+            conn.close()
+            for gid in missing:
+                color = found.get(gid) or 0x00FFFF
+                self._embed_color_cache[gid] = color
+                colors[gid] = color
+        return colors
+
+    def invalidate_embed_color(self, guild_id: int):
+        """Drop a guild's cached embed color (for writers that bypass set_embed_color)."""
+        self._embed_color_cache.pop(guild_id, None)
     
     def set_auto_delete(self, guild_id: int, enabled: bool):
         """Enable or disable auto-delete for a server"""
@@ -974,10 +1162,13 @@ class Database:
         
         conn.commit()
         conn.close()
+        self._auto_delete_cache[guild_id] = bool(enabled)
         logger.info(f"Set auto-delete for guild {guild_id} to {enabled}")
     
     def get_auto_delete(self, guild_id: int) -> bool:
         """Check if auto-delete is enabled for a server"""
+        if guild_id in self._auto_delete_cache:
+            return self._auto_delete_cache[guild_id]
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -990,7 +1181,13 @@ class Database:
         row = cursor.fetchone()
         conn.close()
         
-        return bool(row[0]) if row else False
+        enabled = bool(row[0]) if row else False
+        self._auto_delete_cache[guild_id] = enabled
+        return enabled
+
+    def invalidate_auto_delete(self, guild_id: int):
+        """Drop a guild's cached auto-delete flag (for writers that bypass set_auto_delete)."""
+        self._auto_delete_cache.pop(guild_id, None)
 
     def set_ping_role(self, guild_id: int, role_id: Optional[int]):
         """Set or clear the ping role for stream notifications."""
@@ -1004,16 +1201,48 @@ class Database:
         ''', (guild_id, role_id, role_id))
         conn.commit()
         conn.close()
+        self._ping_role_cache[guild_id] = role_id or None
         logger.info(f"Set ping_role_id for guild {guild_id} to {role_id}")
 
     def get_ping_role(self, guild_id: int) -> Optional[int]:
         """Get the ping role ID for stream notifications (None if not set)."""
+        if guild_id in self._ping_role_cache:
+            return self._ping_role_cache[guild_id]
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT ping_role_id FROM server_settings WHERE guild_id = ?', (guild_id,))
         row = cursor.fetchone()
         conn.close()
-        return row[0] if row and row[0] else None
+        role_id = row[0] if row and row[0] else None
+        self._ping_role_cache[guild_id] = role_id
+        return role_id
+
+    def invalidate_ping_role(self, guild_id: int):
+        """Drop a guild's cached ping role (for writers that bypass set_ping_role)."""
+        self._ping_role_cache.pop(guild_id, None)
+
+    def get_notification_settings(self, guild_id: int) -> Tuple[Optional[int], int, Optional[int]]:
+        """
+        Get (notification channel, embed color, ping role) for a server in one query.
+        Defaults match the single getters, whose caches are filled too.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT notification_channel_id, embed_color, ping_role_id
+            FROM server_settings
+            WHERE guild_id = ?
+        ''', (guild_id,))
+        row = cursor.fetchone()
+        conn.close()
+
+        channel_id = row[0] if row else None
+        color = row[1] if row and row[1] else 0x00FFFF
+        role_id = row[2] if row and row[2] else None
+        self._notification_channel_cache[guild_id] = channel_id
+        self._embed_color_cache[guild_id] = color
+        self._ping_role_cache[guild_id] = role_id
+        return channel_id, color, role_id
 
     def set_milestone_notifications(self, guild_id: int, enabled: bool):
         """Enable or disable milestone notifications for a server"""
@@ -1040,6 +1269,17 @@ class Database:
         conn.close()
         return bool(row[0]) if row else False
 
+    def get_milestone_enabled_guilds(self) -> set:
+        """Get the IDs of every server with milestone notifications enabled"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT guild_id FROM server_settings WHERE milestone_notifications = 1
+        ''')
+        guild_ids = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        return guild_ids
+
     def has_milestone_been_sent(self, guild_id: int, streamer_name: str, milestone_hours: int) -> bool:
         """Check if a milestone notification has already been sent this stream session"""
         conn = self.get_connection()
@@ -1105,7 +1345,39 @@ class Database:
             logger.warning(f"Message {message_id} already saved")
         finally:
             conn.close()
-    
+
+    def record_notifications_sent(self, streamer_name: str, sent: List[tuple]):
+        """Record delivered go-live notifications in one transaction.
+
+        sent holds (guild_id, channel_id, message_id) per delivered message. Does the
+        work of save_notification_message, log_stream_event and log_notification for
+        each of them.
+        """
+        if not sent:
+            return
+        name = streamer_name.lower()
+        rows = [(guild_id, name, channel_id, message_id) for guild_id, channel_id, message_id in sent]
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR IGNORE INTO notification_messages (guild_id, streamer_name, channel_id, message_id)
+            VALUES (?, ?, ?, ?)
+        ''', rows)
+        cursor.executemany(
+            "INSERT INTO stream_events (guild_id, streamer_name) VALUES (?, ?)",
+            [(guild_id, name) for guild_id, name, _, _ in rows]
+        )
+        cursor.execute('''
+            INSERT OR IGNORE INTO global_stream_events (streamer_name, stream_date)
+            VALUES (?, date('now'))
+        ''', (name,))
+        cursor.executemany('''
+            INSERT INTO notification_log (guild_id, streamer_name, channel_id, status)
+            VALUES (?, ?, ?, 'sent')
+        ''', [(guild_id, name, channel_id) for guild_id, name, channel_id, _ in rows])
+        conn.commit()
+        conn.close()
+
     def get_notification_messages(self, guild_id: int, streamer_name: str) -> List[Dict]:
         """Get all notification messages for a streamer in a guild"""
         conn = self.get_connection()
@@ -1756,6 +2028,12 @@ class Database:
         
         conn.commit()
         conn.close()
+        self._birthday_channel_cache.pop(guild_id, None)
+        self._embed_color_cache.pop(guild_id, None)
+        self._auto_delete_cache.pop(guild_id, None)
+        self._ping_role_cache.pop(guild_id, None)
+        self._notification_channel_cache.pop(guild_id, None)
+        self.invalidate_streamers()
         logger.info(f"Cleaned up data for guild {guild_id}")
 
     # ------------------------------------------------------------------
@@ -1786,25 +2064,28 @@ class Database:
         conn.close()
 
     def get_all_birthdays(self, guild_id: int) -> list:
-        """Return all birthday entries for a guild."""
+        """Return all birthday entries for a guild, ordered by month and day."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute('SELECT user_id, day, month, year FROM birthdays WHERE guild_id = ?', (guild_id,))
+        cursor.execute('SELECT user_id, day, month, year FROM birthdays WHERE guild_id = ? ORDER BY month, day', (guild_id,))
         rows = cursor.fetchall()
         conn.close()
         return [{'user_id': r[0], 'day': r[1], 'month': r[2], 'year': r[3]} for r in rows]
 
-    def get_birthdays_on(self, guild_id: int, month: int, day: int) -> list:
-        """Return all birthday entries for a specific day in a guild."""
+    def get_birthdays_for_date(self, month: int, day: int) -> dict:
+        """Return every guild's birthday entries for a specific day, grouped by guild_id."""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute(
-            'SELECT user_id, day, month, year FROM birthdays WHERE guild_id = ? AND month = ? AND day = ?',
-            (guild_id, month, day)
+            'SELECT guild_id, user_id, day, month, year FROM birthdays WHERE month = ? AND day = ?',
+            (month, day)
         )
         rows = cursor.fetchall()
         conn.close()
-        return [{'user_id': r[0], 'day': r[1], 'month': r[2], 'year': r[3]} for r in rows]
+        by_guild = {}
+        for r in rows:
+            by_guild.setdefault(r[0], []).append({'user_id': r[1], 'day': r[2], 'month': r[3], 'year': r[4]})
+        return by_guild
 
     def set_birthday_channel(self, guild_id: int, channel_id: int):
         """Set the birthday announcement channel for a guild."""
@@ -1817,16 +2098,122 @@ class Database:
         ''', (guild_id, channel_id))
         conn.commit()
         conn.close()
+        self._birthday_channel_cache[guild_id] = channel_id
 
     def get_birthday_channel(self, guild_id: int):
         """Get the birthday announcement channel for a guild. Returns None if not set."""
+        if guild_id in self._birthday_channel_cache:
+            return self._birthday_channel_cache[guild_id]
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT channel_id FROM birthday_channels WHERE guild_id = ?', (guild_id,))
         row = cursor.fetchone()
         conn.close()
+        channel_id = row[0] if row else None
+        self._birthday_channel_cache[guild_id] = channel_id
+        return channel_id
+
+    def invalidate_birthday_channel(self, guild_id: int):
+        """Drop a guild's cached birthday channel (for writers that bypass set_birthday_channel)."""
+        self._birthday_channel_cache.pop(guild_id, None)
+
+    def get_all_birthday_channels(self) -> dict:
+        """Return a {guild_id: channel_id} map of every configured birthday channel."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT guild_id, channel_id FROM birthday_channels')
+        rows = cursor.fetchall()
+        conn.close()
+        channels = {r[0]: r[1] for r in rows}
+        self._birthday_channel_cache.update(channels)
+        return channels
+
+    # ----------------------------------------------------------------
+    # Live streams (persisted live_streamers)
+    # ----------------------------------------------------------------
+
+    def mark_stream_live(self, streamer_name: str, started_at: str) -> bool:
+        """Record a streamer's current broadcast.
+
+        Returns True if this broadcast is new, False if it was already recorded
+        (a repeated stream.online delivery, or one handled before a restart).
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO live_streams (streamer_name, started_at)
+            VALUES (?, ?)
+            ON CONFLICT(streamer_name) DO UPDATE SET
+                started_at = excluded.started_at,
+                notified_at = CURRENT_TIMESTAMP
+            WHERE live_streams.started_at != excluded.started_at
+        ''', (streamer_name.lower(), started_at))
+        is_new = cursor.rowcount > 0
+        conn.commit()
+        conn.close()
+        return is_new
+
+    def clear_stream_live(self, streamer_name: Optional[str] = None, started_at: Optional[str] = None):
+        """Forget a streamer's live broadcast, or every one when no name is given.
+
+        With started_at, only that broadcast is forgotten (a newer one is kept).
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if streamer_name is None:
+            cursor.execute('DELETE FROM live_streams')
+        elif started_at is not None:
+            cursor.execute('DELETE FROM live_streams WHERE streamer_name = ? AND started_at = ?',
+                           (streamer_name.lower(), started_at))
+        else:
+            cursor.execute('DELETE FROM live_streams WHERE streamer_name = ?', (streamer_name.lower(),))
+        conn.commit()
+        conn.close()
+
+    def get_live_stream_names(self, max_age_hours: int = 48) -> List[str]:
+        """Return streamers recorded as live, first dropping broadcasts that started more
+        than max_age_hours ago (their stream.offline was missed).
+
+        Twitch ends broadcasts after 48 hours, so the default only drops stale rows;
+        rows without a usable started_at fall back to when they were notified.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            DELETE FROM live_streams
+            WHERE COALESCE(datetime(started_at), notified_at) < datetime('now', ? || ' hours')
+        ''', (f'-{max_age_hours}',))
+        cursor.execute('SELECT streamer_name FROM live_streams')
+        names = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+        conn.close()
+        return names
+
+    # ----------------------------------------------------------------
+    # Bot meta (persisted key/value state)
+    # ----------------------------------------------------------------
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Get a persisted meta value. Returns None if not set."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT value FROM bot_meta WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        conn.close()
         return row[0] if row else None
 
+    def set_meta(self, key: str, value: str):
+        """Set or update a persisted meta value."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO bot_meta (key, value)
+            VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        ''', (key, value))
+        conn.commit()
+        conn.close()
+
     # ----------------------------------------------------------------
     # Reaction roles
     # ----------------------------------------------------------------
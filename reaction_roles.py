@@ -520,10 +520,8 @@ async def setup(bot):
     # /rr create
     # ------------------------------------------------------------------
     @rr_group.command(name="create", description="Start creating a new reaction role message")
+    @app_commands.checks.has_permissions(manage_roles=True)
     async def rr_create(interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.manage_roles:
-            await interaction.response.send_message("❌ You need 'Manage Roles' permission.", ephemeral=True)
-            return
         if interaction.user.id in _sessions:
             await interaction.response.send_message(
                 "❌ You already have an active session. Use `/rr cancel` to cancel it first.",
@@ -553,11 +551,8 @@ async def setup(bot):
         new_role_name="Or type a new role name to create it",
         emoji="Optional emoji (unicode like 🎮 or custom like <:name:id>)"
     )
+    @app_commands.checks.has_permissions(manage_roles=True)
     async def rr_addrole(interaction: discord.Interaction, label: str, role: discord.Role = None, new_role_name: str = None, emoji: str = None):
-        if not interaction.user.guild_permissions.manage_roles:
-            await interaction.response.send_message("❌ You need 'Manage Roles' permission.", ephemeral=True)
-            return
-
         session = _sessions.get(interaction.user.id)
         if not session or session["guild_id"] != interaction.guild_id:
             await interaction.response.send_message("❌ No active session. Run `/rr create` or `/rr edit` first.", ephemeral=True)
@@ -601,11 +596,8 @@ async def setup(bot):
     # /rr publish
     # ------------------------------------------------------------------
     @rr_group.command(name="publish", description="Post or update the reaction role message")
+    @app_commands.checks.has_permissions(manage_roles=True)
     async def rr_publish(interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.manage_roles:
-            await interaction.response.send_message("❌ You need 'Manage Roles' permission.", ephemeral=True)
-            return
-
         session = _sessions.get(interaction.user.id)
         if not session or session["guild_id"] != interaction.guild_id:
             await interaction.response.send_message("❌ No active session. Run `/rr create` or `/rr edit` first.", ephemeral=True)
@@ -686,11 +678,8 @@ async def setup(bot):
     # ------------------------------------------------------------------
     @rr_group.command(name="edit", description="Edit an existing reaction role message")
     @app_commands.describe(message_id="The ID of the reaction role message to edit")
+    @app_commands.checks.has_permissions(manage_roles=True)
     async def rr_edit(interaction: discord.Interaction, message_id: str):
-        if not interaction.user.guild_permissions.manage_roles:
-            await interaction.response.send_message("❌ You need 'Manage Roles' permission.", ephemeral=True)
-            return
-
         entry = bot.db.rr_get(int(message_id))
 
         if not entry or entry["guild_id"] != interaction.guild_id:
@@ -704,11 +693,8 @@ async def setup(bot):
     # ------------------------------------------------------------------
     @rr_group.command(name="sort", description="Sort reaction role options alphabetically by label")
     @app_commands.describe(message_id="The ID of the reaction role message to sort")
+    @app_commands.checks.has_permissions(manage_roles=True)
     async def rr_sort(interaction: discord.Interaction, message_id: str):
-        if not interaction.user.guild_permissions.manage_roles:
-            await interaction.response.send_message("❌ You need 'Manage Roles' permission.", ephemeral=True)
-            return
-
         entry = bot.db.rr_get(int(message_id))
 
         if not entry or entry["guild_id"] != interaction.guild_id:
@@ -740,11 +726,8 @@ async def setup(bot):
     # ------------------------------------------------------------------
     @rr_group.command(name="delete", description="Delete a reaction role message")
     @app_commands.describe(message_id="The ID of the reaction role message to delete")
+    @app_commands.checks.has_permissions(manage_roles=True)
     async def rr_delete(interaction: discord.Interaction, message_id: str):
-        if not interaction.user.guild_permissions.manage_roles:
-            await interaction.response.send_message("❌ You need 'Manage Roles' permission.", ephemeral=True)
-            return
-
         entry = bot.db.rr_get(int(message_id))
 
         if not entry or entry["guild_id"] != interaction.guild_id:
@@ -768,11 +751,8 @@ async def setup(bot):
     # /rr list
     # ------------------------------------------------------------------
     @rr_group.command(name="list", description="List all reaction role messages in this server")
+    @app_commands.checks.has_permissions(manage_roles=True)
     async def rr_list(interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.manage_roles:
-            await interaction.response.send_message("❌ You need 'Manage Roles' permission.", ephemeral=True)
-            return
-
         panels = bot.db.rr_get_for_guild(interaction.guild_id)
 
         if not panels:
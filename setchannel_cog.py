@@ -110,11 +110,8 @@ class SetChannelView(discord.ui.View):
 async def setup(discord_bot):
     @app_commands.default_permissions(manage_guild=True)
     @discord_bot.tree.command(name="setchannel", description="Configure notification channels (stream alerts, birthdays, and more)")
+    @app_commands.checks.has_permissions(manage_guild=True)
     async def setchannel(interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.manage_guild:
-            await interaction.response.send_message("❌ You need 'Manage Server' permission to use this command.", ephemeral=True)
-            return
-
         view = SetChannelView(discord_bot.db)
         await interaction.response.send_message("Which channel would you like to configure?", view=view, ephemeral=True)
 
@@ -0,0 +1,12 @@
+def chunk_lines(lines, limit: int) -> list:
+    """Join lines with newlines into as few strings as fit under `limit` chars each."""
+    chunks, current, size = [], [], 0
+    for line in lines:
+        if current and size + len(line) + 1 > limit:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
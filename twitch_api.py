@@ -1,10 +1,29 @@
 import aiohttp
+import asyncio
+import contextlib
 import logging
-from datetime import datetime, timedelta
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from config import TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET
 
 logger = logging.getLogger(__name__)
 
+# Twitch logins are 1-25 letters, digits or underscores. Helix rejects a whole
+# /users batch if any login in it is malformed, so bulk lookups pre-filter.
+LOGIN_RE = re.compile(r'^[a-zA-Z0-9_]{1,25}$')
+
+# get_user() results are kept this long (seconds), for at most this many logins
+USER_CACHE_TTL = 3600
+USER_CACHE_SIZE = 4096
+
+# Helix batch requests (100 logins each, /streams or /users) allowed in flight at once
+HELIX_BATCH_CONCURRENCY = 4
+
+# Longest rate_gate() will hold a request back waiting for the Helix bucket to refill
+RATE_LIMIT_MAX_WAIT = 60
+
 class TwitchAPI:
     def __init__(self):
         self.client_id = TWITCH_CLIENT_ID
@@ -13,13 +32,69 @@ class TwitchAPI:
         self.token_expires_at = None
         self.base_url = "https://api.twitch.tv/helix"
         self._session = None
+        # login -> (monotonic fetch time, user dict), least recently used first
+        self._user_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._batch_sem = asyncio.Semaphore(HELIX_BATCH_CONCURRENCY)
+        # Helix rate-limit bucket as of the last response (Ratelimit-* headers)
+        self._ratelimit_remaining: int | None = None
+        self._ratelimit_reset = 0.0
 
     async def get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
+        """Get or create the shared aiohttp session (pooled keep-alive connections)"""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_end.append(self._on_request_end)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30),
+                trace_configs=[trace_config]
+            )
         return self._session
 
+    async def _on_request_end(self, session, ctx, params):
+        """
+        Record the Helix rate-limit bucket from responses to app-token Helix requests.
+        Other requests on the shared session (OAuth token calls, user-token requests
+        such as chat message deletes) report separate buckets and are ignored.
+        """
+        if params.url.host != "api.twitch.tv" or not self.access_token:
+            return
+        if params.headers.get("Authorization") != f"Bearer {self.access_token}":
+            return
+        headers = params.response.headers
+        remaining = headers.get("Ratelimit-Remaining")
+        reset = headers.get("Ratelimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            self._ratelimit_remaining = int(remaining)
+            self._ratelimit_reset = float(reset)
+        except ValueError:
+            pass
+
+    @contextlib.asynccontextmanager
+    async def rate_gate(self):
+        """
+        Hold a Helix request back while the rate-limit bucket is nearly empty.
+        Waits for the bucket's reset time (at most RATE_LIMIT_MAX_WAIT seconds) once
+        no more than HELIX_BATCH_CONCURRENCY points remain, then lets the request through.
+        """
+        if self._ratelimit_remaining is not None:
+            if self._ratelimit_remaining <= HELIX_BATCH_CONCURRENCY:
+                delay = self._ratelimit_reset - time.time()
+                if delay > 0:
+                    logger.warning(f"Twitch rate limit nearly spent, waiting {delay:.1f}s for reset")
+                    await asyncio.sleep(min(delay, RATE_LIMIT_MAX_WAIT))
+            # Count this request against the bucket until its response updates it
+            self._ratelimit_remaining -= 1
+        yield
+
     async def close(self):
         """Close the aiohttp session"""
         if self._session and not self._session.closed:
@@ -66,11 +141,30 @@ class TwitchAPI:
         """
         Check which streamers from the list are currently live.
         Returns list of stream objects for live streamers.
-        Handles batches of up to 100.
+        Any number of usernames: batches of 100 are fetched concurrently,
+        at most HELIX_BATCH_CONCURRENCY at a time.
         """
         if not usernames:
             return []
 
+        results = await asyncio.gather(
+            *(self._get_live_streams_batch(usernames[i:i+100]) for i in range(0, len(usernames), 100)),
+            return_exceptions=True
+        )
+        streams = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching live streams batch: {result}")
+                continue
+            streams.extend(result)
+        return streams
+
+    async def _get_live_streams_batch(self, usernames: list) -> list:
+        """Fetch live streams (with profile images) for up to 100 usernames."""
+        async with self._batch_sem, self.rate_gate():
+            return await self._fetch_live_streams(usernames)
+
+    async def _fetch_live_streams(self, usernames: list) -> list:
         session = await self.get_session()
         headers = await self._headers()
 
@@ -141,7 +235,14 @@ class TwitchAPI:
         """
         Get user info for a single Twitch username.
         Returns user dict or None if not found.
+        Found users are cached for USER_CACHE_TTL seconds; misses are not cached.
         """
+        login = username.lower()
+        cached = self._user_cache.get(login)
+        if cached and time.monotonic() - cached[0] < USER_CACHE_TTL:
+            self._user_cache.move_to_end(login)
+            return cached[1]
+
         session = await self.get_session()
         headers = await self._headers()
 
@@ -149,19 +250,91 @@ class TwitchAPI:
             async with session.get(
                 f"{self.base_url}/users",
                 headers=headers,
-                params={"login": username.lower()}
+                params={"login": login}
             ) as resp:
                 if resp.status != 200:
                     logger.error(f"Twitch users API error: {resp.status}")
                     return None
                 data = await resp.json()
                 users = data.get("data", [])
-                return users[0] if users else None
+                if not users:
+                    return None
+                self._cache_user(login, users[0])
+                return users[0]
 
         except Exception as e:
             logger.error(f"Error fetching user {username}: {e}", exc_info=True)
             return None
 
+    def _cache_user(self, login: str, user: dict):
+        """Store a get_user() result, evicting the least recently used entry when full."""
+        self._user_cache[login] = (time.monotonic(), user)
+        self._user_cache.move_to_end(login)
+        if len(self._user_cache) > USER_CACHE_SIZE:
+            self._user_cache.popitem(last=False)
+
+    async def get_users_bulk(self, logins: list) -> dict:
+        """
+        Get user info for many Twitch usernames, up to 100 per request.
+        Batches run concurrently, at most HELIX_BATCH_CONCURRENCY at a time.
+        Returns {login: user dict}; logins that don't exist (or are malformed) are omitted,
+        while logins whose batch request failed map to None so callers can tell a
+        lookup failure from a missing account. Found users also seed the get_user() cache.
+        """
+        unique = list(dict.fromkeys(l.lower() for l in logins if LOGIN_RE.match(l)))
+        users, failed = await self._get_users_batched("login", unique)
+        found = {user["login"].lower(): user for user in users}
+        for login, user in found.items():
+            self._cache_user(login, user)
+        found.update(dict.fromkeys(failed))
+        return found
+
+    async def get_users_by_ids(self, user_ids: list) -> dict:
+        """
+        Get user info for many Twitch user IDs, batched like get_users_bulk.
+        Returns {user ID: user dict}; IDs that no longer exist (or whose batch failed) are omitted.
+        """
+        users, _ = await self._get_users_batched("id", list(dict.fromkeys(user_ids)))
+        return {user["id"]: user for user in users}
+
+    async def _get_users_batched(self, key: str, values: list) -> tuple[list, list]:
+        """
+        Query /users with up to 100 `key=` params per request, batches fanned out concurrently.
+        Returns (users found, values from batches whose request failed).
+        """
+        if not values:
+            return [], []
+
+        session = await self.get_session()
+        headers = await self._headers()
+
+        async def _fetch(batch: list) -> list | None:
+            params = [(key, value) for value in batch]
+            try:
+                async with self._batch_sem, self.rate_gate(), session.get(
+                    f"{self.base_url}/users",
+                    headers=headers,
+                    params=params
+                ) as resp:
+                    if resp.status != 200:
+                        logger.error(f"Twitch users API error: {resp.status}")
+                        return None
+                    data = await resp.json()
+                return data.get("data", [])
+            except Exception as e:
+                logger.error(f"Error fetching users batch: {e}", exc_info=True)
+                return None
+
+        chunks = [values[i:i+100] for i in range(0, len(values), 100)]
+        batches = await asyncio.gather(*(_fetch(chunk) for chunk in chunks))
+        users, failed = [], []
+        for chunk, batch in zip(chunks, batches):
+            if batch is None:
+                failed.extend(chunk)
+            else:
+                users.extend(batch)
+        return users, failed
+
     async def get_user_by_id(self, user_id: str) -> dict | None:
         """Get user info by Twitch user ID"""
         session = await self.get_session()
@@ -268,8 +441,8 @@ class TwitchAPI:
         if not started_at_str:
             return None
 
-        started_at = datetime.strptime(started_at_str, "%Y-%m-%dT%H:%M:%SZ")
-        delta = datetime.utcnow() - started_at
+        started_at = datetime.fromisoformat(started_at_str)
+        delta = datetime.now(timezone.utc) - started_at
 
         total_seconds = int(delta.total_seconds())
         hours = total_seconds // 3600
@@ -361,13 +534,15 @@ class TwitchAPI:
             logger.error(f"Error deleting EventSub subscription {subscription_id}: {e}")
             return False
 
-    async def get_subscriptions(self, status: str = None) -> list:
-        """List all current EventSub subscriptions (optionally filter by status)."""
+    async def get_subscriptions(self, status: str = None, user_id: str = None) -> list:
+        """List current EventSub subscriptions (optionally filter by status or broadcaster user ID)."""
         session = await self.get_session()
         headers = await self._headers()
         params = {}
         if status:
             params["status"] = status
+        if user_id:
+            params["user_id"] = user_id
         all_subs = []
         cursor = None
         try:
@@ -1,6 +1,7 @@
 import asyncio
 from twitchio.ext import commands 
 import logging
+import time
 from datetime import datetime
 from database import Database
 from twitch_api import TwitchAPI
@@ -19,14 +20,14 @@ class TwitchChatBot(commands.Bot):
         )
         self.db = db
         self.twitch_api = twitch_api
-        self._cooldowns: dict[str, dict[str, datetime]] = {}
+        self._cooldowns: dict[str, dict[str, float]] = {}  # time.monotonic() of last use
 
     async def event_ready(self):
         import asyncio as _asyncio
         logger.info(f"Twitch chat bot ready | Nick: {self.nick}")
         await _asyncio.sleep(3)
         registered = self.db.get_all_twitch_channels()
-        connected_names = [c.name.lower() for c in self.connected_channels]
+        connected_names = {c.name.lower() for c in self.connected_channels}
         for row in registered:
             channel_name = row["twitch_channel"].lower()
             if channel_name not in connected_names:
@@ -213,7 +214,7 @@ class TwitchChatBot(commands.Bot):
 
             if last_date:
                 try:
-                    dt = datetime.strptime(last_date, "%Y-%m-%dT%H:%M:%SZ")
+                    dt = datetime.fromisoformat(last_date)
                     date_str = dt.strftime("%b %d")
                 except Exception:
                     date_str = None
@@ -280,10 +281,10 @@ class TwitchChatBot(commands.Bot):
         return text
 
     async def _check_cooldown(self, channel: str, command: str, seconds: int) -> bool:
-        now = datetime.utcnow()
+        now = time.monotonic()
         channel_cooldowns = self._cooldowns.setdefault(channel, {})
         last_used = channel_cooldowns.get(command)
-        if last_used and (now - last_used).total_seconds() < seconds:
+        if last_used is not None and now - last_used < seconds:
             return False
         channel_cooldowns[command] = now
         return True
@@ -292,13 +293,11 @@ class TwitchChatBot(commands.Bot):
     async def _delete_msg(self, channel_name: str, message_id: str):
         """Delete a chat message using the broadcaster's OAuth token — broadcaster can delete any message."""
         try:
-            import aiohttp
             from config import TWITCH_CLIENT_ID
 
-            # Look up guild_id from channel name
-            all_channels = self.db.get_all_twitch_channels()
-            guild_id = next((ch["guild_id"] for ch in all_channels
-                             if ch["twitch_channel"].lower() == channel_name.lower()), None)
+            # Look up guild_id from channel name (stored lowercase, queried directly)
+            linked = self.db.get_guilds_for_twitch_channel(channel_name)
+            guild_id = linked[0]["guild_id"] if linked else None
             if not guild_id:
                 return
 
@@ -310,24 +309,24 @@ class TwitchChatBot(commands.Bot):
             access_token   = row["access_token"]
             broadcaster_id = row["twitch_user_id"]
 
-            async with aiohttp.ClientSession() as session:
-                async with session.delete(
-                    "https://api.twitch.tv/helix/moderation/chat",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Client-Id": TWITCH_CLIENT_ID,
-                    },
-                    params={
-                        "broadcaster_id": broadcaster_id,
-                        "moderator_id":   broadcaster_id,  # broadcaster is their own moderator
-                        "message_id":     message_id,
-                    }
-                ) as resp:
-                    if resp.status not in (200, 204):
-                        text = await resp.text()
-                        logger.error(f"Delete FAILED {resp.status}: {text}")
-                    else:
-                        logger.debug(f"Delete OK: {message_id}")
+            session = await self.twitch_api.get_session()
+            async with session.delete(
+                "https://api.twitch.tv/helix/moderation/chat",
+                headers={
+                    "Authorization": f"Bearer {access_token}",
+                    "Client-Id": TWITCH_CLIENT_ID,
+                },
+                params={
+                    "broadcaster_id": broadcaster_id,
+                    "moderator_id":   broadcaster_id,  # broadcaster is their own moderator
+                    "message_id":     message_id,
+                }
+            ) as resp:
+                if resp.status not in (200, 204):
+                    text = await resp.text()
+                    logger.error(f"Delete FAILED {resp.status}: {text}")
+                else:
+                    logger.debug(f"Delete OK: {message_id}")
         except Exception as e:
             logger.error(f"Delete exception: {e}")
 
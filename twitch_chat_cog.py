@@ -177,11 +177,8 @@ async def setup(discord_bot, twitch_chat_bot):
     @app_commands.default_permissions(manage_guild=True)
     @discord_bot.tree.command(name="twitchset", description="Link this Discord server to your Twitch channel")
     @app_commands.describe(channel="Your Twitch channel name (e.g. ninja)")
+    @app_commands.checks.has_permissions(manage_guild=True)
     async def twitch_setchannel(interaction: discord.Interaction, channel: str):
-        if not interaction.user.guild_permissions.manage_guild:
-            await interaction.response.send_message("❌ You need 'Manage Server' permission.", ephemeral=True)
-            return
-
         await interaction.response.defer(ephemeral=True)
         channel_name = channel.lower().strip().lstrip("@")
 
@@ -206,11 +203,8 @@ async def setup(discord_bot, twitch_chat_bot):
     # ------------------------------------------------------------------
     @app_commands.default_permissions(manage_guild=True)
     @discord_bot.tree.command(name="twitchremove", description="Unlink this server from its Twitch channel")
+    @app_commands.checks.has_permissions(manage_guild=True)
     async def twitch_removechannel(interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.manage_guild:
-            await interaction.response.send_message("❌ You need 'Manage Server' permission.", ephemeral=True)
-            return
-
         row = discord_bot.db.get_twitch_channel(interaction.guild_id)
         if not row:
             await interaction.response.send_message("❌ No Twitch channel linked.", ephemeral=True)
@@ -285,11 +279,8 @@ async def setup(discord_bot, twitch_chat_bot):
     # ------------------------------------------------------------------
     @app_commands.default_permissions(manage_guild=True)
     @discord_bot.tree.command(name="cmd", description="Add or edit a custom Twitch chat command")
+    @app_commands.checks.has_permissions(manage_guild=True)
     async def cmd(interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.manage_guild:
-            await interaction.response.send_message("❌ You need 'Manage Server' permission.", ephemeral=True)
-            return
-
         row = discord_bot.db.get_twitch_channel(interaction.guild_id)
         if not row:
             await interaction.response.send_message("❌ No Twitch channel linked. Use `/twitchset` first.", ephemeral=True)
@@ -311,11 +302,8 @@ async def setup(discord_bot, twitch_chat_bot):
     # ------------------------------------------------------------------
     @app_commands.default_permissions(manage_guild=True)
     @discord_bot.tree.command(name="cmdremove", description="Remove a custom Twitch chat command")
+    @app_commands.checks.has_permissions(manage_guild=True)
     async def cmd_remove(interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.manage_guild:
-            await interaction.response.send_message("❌ You need 'Manage Server' permission.", ephemeral=True)
-            return
-
         row = discord_bot.db.get_twitch_channel(interaction.guild_id)
         if not row:
             await interaction.response.send_message("❌ No Twitch channel linked.", ephemeral=True)